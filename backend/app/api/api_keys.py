@@ -0,0 +1,78 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta
+from typing import List, Optional
+from ..core.database import get_async_db, get_read_db
+from ..core.auth import TokenPrincipal, get_admin_user, principal_cache
+from ..core.security import create_api_key, hash_api_key
+from ..models.api_key import ApiKey
+from ..models.user import User
+from ..schemas.api_key import ApiKeyCreate, ApiKeyCreated, ApiKeyResponse
+
+router = APIRouter()
+
+
+@router.get("/api-keys", response_model=List[ApiKeyResponse])
+async def get_api_keys(
+    user_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: TokenPrincipal = Depends(get_admin_user)
+):
+    statement = select(ApiKey)
+    
+    if user_id:
+        statement = statement.where(ApiKey.user_id == user_id)
+    
+    return (await db.scalars(statement.order_by(ApiKey.id))).all()
+
+
+@router.post("/api-keys", response_model=ApiKeyCreated)
+async def create_api_key_for_user(
+    key_data: ApiKeyCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenPrincipal = Depends(get_admin_user)
+):
+    """Issue a key for a service account; the plaintext key is only returned here"""
+    if not await db.scalar(select(User.id).where(User.id == key_data.user_id)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    key = create_api_key()
+    api_key = ApiKey(
+        name=key_data.name,
+        key_digest=hash_api_key(key),
+        prefix=key[:12],
+        scopes=" ".join(sorted(set(key_data.scopes))),
+        user_id=key_data.user_id,
+        expires_at=datetime.utcnow() + timedelta(days=key_data.expires_in_days) if key_data.expires_in_days else None
+    )
+    
+    db.add(api_key)
+    await db.commit()
+    await db.refresh(api_key)
+    
+    return {**ApiKeyResponse.model_validate(api_key).model_dump(), "key": key}
+
+
+@router.delete("/api-keys/{key_id}")
+async def revoke_api_key(
+    key_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenPrincipal = Depends(get_admin_user)
+):
+    api_key = await db.get(ApiKey, key_id)
+    if not api_key:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="API key not found"
+        )
+    
+    if api_key.revoked_at is None:
+        api_key.revoked_at = datetime.utcnow()
+        await db.commit()
+    principal_cache.pop(("api_key", api_key.key_digest))
+    
+    return {"message": "API key revoked successfully"}
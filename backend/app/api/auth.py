@@ -1,50 +1,173 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from datetime import timedelta
-from ..core.database import get_db
-from ..core.security import verify_password, get_password_hash, create_access_token
+import math
+import secrets
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta
+from typing import Optional
+from ..core.auth import token_claims
+from ..core.database import AsyncSessionLocal, get_async_db
+from ..core.hashing import PasswordHasherBusy, password_hasher
+from ..core.security import create_access_token, create_refresh_token, hash_refresh_token, password_needs_rehash
+from ..core.throttle import login_throttle
 from ..core.config import settings
+from ..models.refresh_token import RefreshToken
 from ..models.user import User
-from ..schemas.user import Token, LoginRequest, UserCreate, UserResponse
+from ..schemas.user import Token, LoginRequest, RefreshRequest, UserCreate, UserResponse
 
 router = APIRouter()
 
 
+def issue_tokens(db: AsyncSession, user: User, family_id: Optional[str] = None) -> dict:
+    """New access token plus a refresh token stored by digest (caller commits)"""
+    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
+    access_token = create_access_token(
+        subject=user.username, expires_delta=access_token_expires, claims=token_claims(user)
+    )
+
+    refresh_token = create_refresh_token()
+    db.add(RefreshToken(
+        token_hash=hash_refresh_token(refresh_token),
+        family_id=family_id or secrets.token_hex(16),
+        token_version=user.token_version,
+        user_id=user.id,
+        expires_at=datetime.utcnow() + timedelta(days=settings.refresh_token_expire_days)
+    ))
+
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+
+async def revoke_token_family(db: AsyncSession, family_id: str) -> None:
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+
+
+async def find_refresh_token(db: AsyncSession, token: str) -> Optional[RefreshToken]:
+    return await db.scalar(
+        select(RefreshToken).where(RefreshToken.token_hash == hash_refresh_token(token))
+    )
+
+
+def _invalid_refresh_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def rehash_password(user_id: int, old_hash: str, password: str) -> None:
+    """Re-hash with the configured cost after the login response went out"""
+    try:
+        new_hash = await password_hasher.hash_async(password)
+    except PasswordHasherBusy:
+        return  # Try again on the next login
+
+    async with AsyncSessionLocal() as db:
+        # Skip if the password was changed in the meantime
+        await db.execute(
+            update(User)
+            .where(User.id == user_id, User.hashed_password == old_hash)
+            .values(hashed_password=new_hash)
+        )
+        await db.commit()
+
+
 @router.post("/login", response_model=Token)
-def login(login_data: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.username == login_data.username).first()
-    if not user or not verify_password(login_data.password, user.hashed_password):
+async def login(
+    login_data: LoginRequest,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Checked before the user lookup so a flood never reaches bcrypt. Off the event
+    # loop: the SQLite backend can wait on its file lock
+    retry_after = await run_in_threadpool(
+        login_throttle.check, login_data.username, request.client.host if request.client else None
+    )
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+    user = await db.scalar(select(User).where(User.username == login_data.username))
+    if not user or not await password_hasher.verify_async(login_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    await run_in_threadpool(login_throttle.succeeded, login_data.username)
+    if password_needs_rehash(user.hashed_password):
+        background_tasks.add_task(rehash_password, user.id, user.hashed_password, login_data.password)
     
-    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-    access_token = create_access_token(
-        subject=user.username, expires_delta=access_token_expires
-    )
-    return {"access_token": access_token, "token_type": "bearer"}
+    tokens = issue_tokens(db, user)
+    await db.commit()
+    return tokens
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh(refresh_data: RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    """Rotate a refresh token into a new token pair; no password check involved"""
+    record = await find_refresh_token(db, refresh_data.refresh_token)
+    if not record or record.expires_at <= datetime.utcnow():
+        raise _invalid_refresh_token()
+
+    # Claim the token with a conditional UPDATE so each one is usable exactly once
+    claimed = (await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == record.id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )).rowcount
+    if not claimed:
+        # An already rotated token came back: assume it leaked and end the session
+        await revoke_token_family(db, record.family_id)
+        await db.commit()
+        raise _invalid_refresh_token()
+
+    user = await db.get(User, record.user_id)
+    if user is None or user.token_version != record.token_version:
+        await db.commit()
+        raise _invalid_refresh_token()
+
+    tokens = issue_tokens(db, user, family_id=record.family_id)
+    await db.commit()
+    return tokens
+
+
+@router.post("/logout")
+async def logout(refresh_data: RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    record = await find_refresh_token(db, refresh_data.refresh_token)
+    if record:
+        await revoke_token_family(db, record.family_id)
+        await db.commit()
+    return {"message": "Logged out successfully"}
 
 
 @router.post("/register", response_model=UserResponse)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     # Check if username exists
-    if db.query(User).filter(User.username == user_data.username).first():
+    if await db.scalar(select(User.id).where(User.username == user_data.username)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered"
         )
     
     # Check if email exists
-    if db.query(User).filter(User.email == user_data.email).first():
+    if await db.scalar(select(User.id).where(User.email == user_data.email)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await password_hasher.hash_async(user_data.password)
     db_user = User(
         username=user_data.username,
         email=user_data.email,
@@ -54,7 +177,7 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
\ No newline at end of file
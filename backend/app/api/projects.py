@@ -1,31 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from ..core.database import get_db
-from ..core.auth import get_current_user, get_admin_or_team_lead_user
-from ..models.user import User
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Literal, Optional
+from ..core.config import settings
+from ..core.database import get_async_db, get_read_db
+from ..core.auth import TokenPrincipal, get_token_principal, get_admin_or_team_lead_user
 from ..models.project import Project
-from ..schemas.project import ProjectResponse, ProjectCreate, ProjectUpdate
+from ..models.story import Story, StoryStatus
+from ..models.user import User
+from ..schemas.project import ProjectResponse, ProjectCreate, ProjectUpdate, ProjectBoardResponse
+from .stories import STORY_SORT_KEYS, serialize_stories, story_cursor, story_view_options
 
 router = APIRouter()
 
 
 @router.get("/projects", response_model=List[ProjectResponse])
-def get_projects(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_projects(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: TokenPrincipal = Depends(get_token_principal)
 ):
-    projects = db.query(Project).all()
+    projects = (await db.scalars(select(Project))).all()
     return projects
 
 
 @router.get("/projects/{project_id}", response_model=ProjectResponse)
-def get_project(
+async def get_project(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: TokenPrincipal = Depends(get_token_principal)
 ):
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -34,18 +38,116 @@ def get_project(
     return project
 
 
+def _parse_column_limits(limits: Optional[str], default: int) -> Dict[StoryStatus, int]:
+    """Parse per-column page sizes, e.g. Completed:5,Backlog:50"""
+    column_limits = {story_status: default for story_status in StoryStatus}
+    for item in filter(None, (limits or "").split(",")):
+        name, _, size = item.rpartition(":")
+        try:
+            story_status = StoryStatus(name.strip())
+            size = int(size)
+        except ValueError:
+            story_status = None
+        if story_status is None or not 0 <= size <= settings.max_page_size:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid column limit: {item}"
+            )
+        column_limits[story_status] = size
+    return column_limits
+
+
+@router.get("/projects/{project_id}/board", response_model=ProjectBoardResponse)
+async def get_project_board(
+    project_id: int,
+    sprint_id: Optional[int] = None,
+    limit: int = Query(20, ge=0, le=settings.max_page_size),
+    limits: Optional[str] = None,
+    view: Literal["full", "card"] = "card",
+    db: AsyncSession = Depends(get_read_db),
+    current_user: TokenPrincipal = Depends(get_token_principal)
+):
+    """Stories grouped into one column per status, each with its count and point total.
+
+    Every column holds its first `limit` cards (override per column with `limits`,
+    e.g. "Completed:5"); `next_cursor` pages through the rest via GET /api/stories.
+    """
+    if not await db.scalar(select(Project.id).where(Project.id == project_id)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    column_limits = _parse_column_limits(limits, limit)
+
+    scope = [Story.project_id == project_id]
+    if sprint_id is not None:
+        scope.append(Story.sprint_id == sprint_id)
+
+    totals = {
+        story_status: (count, points)
+        for story_status, count, points in await db.execute(
+            select(Story.status, func.count(Story.id), func.coalesce(func.sum(Story.story_points), 0))
+            .where(*scope).group_by(Story.status)
+        )
+    }
+
+    # Top N ids of every column: one short LIMIT per status, each an ordered range of
+    # ix_stories_project_status_priority, then the cards themselves by primary key
+    column_ids = [
+        select(Story.id).where(*scope, Story.status == story_status)
+        .order_by(*STORY_SORT_KEYS["priority"]).limit(size).subquery()
+        for story_status, size in column_limits.items() if size
+    ]
+    cards = []
+    if column_ids:
+        cards = (await db.scalars(
+            select(Story).options(*story_view_options(view)).where(
+                Story.id.in_(union_all(*(select(ids.c.id) for ids in column_ids)))
+            ).order_by(*STORY_SORT_KEYS["priority"])
+        )).all()
+
+    stories_by_status = {story_status: [] for story_status in StoryStatus}
+    for story in cards:
+        stories_by_status[story.status].append(story)
+
+    columns = []
+    for story_status, stories in stories_by_status.items():
+        count, points = totals.get(story_status, (0, 0))
+        next_cursor = None
+        if stories and count > len(stories):
+            next_cursor = story_cursor(stories[-1], "priority", "asc")
+        columns.append({
+            "status": story_status,
+            "count": count,
+            "story_points": points,
+            "stories": serialize_stories(stories, view),
+            "next_cursor": next_cursor,
+        })
+
+    return {"project_id": project_id, "sprint_id": sprint_id, "columns": columns}
+
+
+async def _check_team_lead(db: AsyncSession, team_lead_id: Optional[int]):
+    if team_lead_id is not None and not await db.get(User, team_lead_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Team lead not found"
+        )
+
+
 @router.post("/projects", response_model=ProjectResponse)
-def create_project(
+async def create_project(
     project_data: ProjectCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_or_team_lead_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenPrincipal = Depends(get_admin_or_team_lead_user)
 ):
     # Check if prefix already exists
-    if db.query(Project).filter(Project.prefix == project_data.prefix).first():
+    if await db.scalar(select(Project.id).where(Project.prefix == project_data.prefix)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Project prefix already exists"
         )
+    await _check_team_lead(db, project_data.team_lead_id)
     
     db_project = Project(
         name=project_data.name,
@@ -56,20 +158,20 @@ def create_project(
     )
     
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await db.refresh(db_project)
     
     return db_project
 
 
 @router.put("/projects/{project_id}", response_model=ProjectResponse)
-def update_project(
+async def update_project(
     project_id: int,
     project_data: ProjectUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_or_team_lead_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenPrincipal = Depends(get_admin_or_team_lead_user)
 ):
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -80,35 +182,37 @@ def update_project(
     
     # Check if new prefix conflicts with existing one
     if "prefix" in update_data and update_data["prefix"] != project.prefix:
-        if db.query(Project).filter(Project.prefix == update_data["prefix"]).first():
+        if await db.scalar(select(Project.id).where(Project.prefix == update_data["prefix"])):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Project prefix already exists"
             )
+    if "team_lead_id" in update_data:
+        await _check_team_lead(db, update_data["team_lead_id"])
     
     for field, value in update_data.items():
         setattr(project, field, value)
     
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    await db.refresh(project)
     
     return project
 
 
 @router.delete("/projects/{project_id}")
-def delete_project(
+async def delete_project(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_or_team_lead_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenPrincipal = Depends(get_admin_or_team_lead_user)
 ):
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
-    db.delete(project)
-    db.commit()
+    await db.delete(project)
+    await db.commit()
     
     return {"message": "Project deleted successfully"}
\ No newline at end of file
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from ..core.database import get_db
-from ..core.auth import get_current_user, get_admin_or_team_lead_user
-from ..models.user import User, UserRole
+from ..core.database import get_async_db, get_read_db
+from ..core.auth import TokenPrincipal, get_token_principal, get_admin_or_team_lead_user
+from ..models.user import UserRole
 from ..models.sprint import Sprint
 from ..models.project import Project
 from ..schemas.sprint import SprintResponse, SprintCreate, SprintUpdate
@@ -12,27 +13,27 @@ router = APIRouter()
 
 
 @router.get("/sprints", response_model=List[SprintResponse])
-def get_sprints(
+async def get_sprints(
     project_id: Optional[int] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: TokenPrincipal = Depends(get_token_principal)
 ):
-    query = db.query(Sprint)
+    statement = select(Sprint)
     
     if project_id:
-        query = query.filter(Sprint.project_id == project_id)
+        statement = statement.where(Sprint.project_id == project_id)
     
-    sprints = query.all()
+    sprints = (await db.scalars(statement)).all()
     return sprints
 
 
 @router.get("/sprints/{sprint_id}", response_model=SprintResponse)
-def get_sprint(
+async def get_sprint(
     sprint_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: TokenPrincipal = Depends(get_token_principal)
 ):
-    sprint = db.query(Sprint).filter(Sprint.id == sprint_id).first()
+    sprint = await db.get(Sprint, sprint_id)
     if not sprint:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -42,13 +43,13 @@ def get_sprint(
 
 
 @router.post("/sprints", response_model=SprintResponse)
-def create_sprint(
+async def create_sprint(
     sprint_data: SprintCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_or_team_lead_user)  # Only Team Leads and Admins can create sprints
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenPrincipal = Depends(get_admin_or_team_lead_user)  # Only Team Leads and Admins can create sprints
 ):
     # Verify project exists
-    project = db.query(Project).filter(Project.id == sprint_data.project_id).first()
+    project = await db.get(Project, sprint_data.project_id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -73,20 +74,20 @@ def create_sprint(
     )
     
     db.add(db_sprint)
-    db.commit()
-    db.refresh(db_sprint)
+    await db.commit()
+    await db.refresh(db_sprint)
     
     return db_sprint
 
 
 @router.put("/sprints/{sprint_id}", response_model=SprintResponse)
-def update_sprint(
+async def update_sprint(
     sprint_id: int,
     sprint_data: SprintUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_or_team_lead_user)  # Only Team Leads and Admins can update sprints
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenPrincipal = Depends(get_admin_or_team_lead_user)  # Only Team Leads and Admins can update sprints
 ):
-    sprint = db.query(Sprint).filter(Sprint.id == sprint_id).first()
+    sprint = await db.get(Sprint, sprint_id)
     if not sprint:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -108,26 +109,26 @@ def update_sprint(
     for field, value in update_data.items():
         setattr(sprint, field, value)
     
-    db.commit()
-    db.refresh(sprint)
+    await db.commit()
+    await db.refresh(sprint)
     
     return sprint
 
 
 @router.delete("/sprints/{sprint_id}")
-def delete_sprint(
+async def delete_sprint(
     sprint_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_or_team_lead_user)  # Only Team Leads and Admins can delete sprints
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenPrincipal = Depends(get_admin_or_team_lead_user)  # Only Team Leads and Admins can delete sprints
 ):
-    sprint = db.query(Sprint).filter(Sprint.id == sprint_id).first()
+    sprint = await db.get(Sprint, sprint_id)
     if not sprint:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Sprint not found"
         )
     
-    db.delete(sprint)
-    db.commit()
+    await db.delete(sprint)
+    await db.commit()
     
     return {"message": "Sprint deleted successfully"}
\ No newline at end of file
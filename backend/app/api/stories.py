@@ -1,68 +1,318 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from ..core.database import get_db
-from ..core.auth import get_current_user
+import csv
+import enum
+import io
+import json
+import re
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import column, func, insert, literal_column, select, table, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from typing import Dict, List, Literal, Optional, Union
+from pydantic import ValidationError
+from ..core.config import settings
+from ..core.database import get_async_db, get_read_db, read_session
+from ..core.auth import TokenPrincipal, get_current_user, get_token_principal
+from ..core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, keyset_after
 from ..models.user import User
-from ..models.story import Story
+from ..models.story import PRIORITY_RANKS, UNRANKED_PRIORITY, Story, StoryStatus, points_rank, priority_rank
 from ..models.project import Project
-from ..schemas.story import StoryResponse, StoryCreate, StoryUpdate
+from ..models.sprint import Sprint
+from ..models.story_sequence import StorySequence
+from ..schemas import validation_error_detail
+from ..schemas.story import (
+    StoryResponse, StoryCardResponse, StoryCreate, StoryUpdate, StorySearchResult,
+    StoryBulkCreate, StoryBulkCreateResponse, StoryBulkUpdate, StoryBulkUpdateResponse
+)
 
 router = APIRouter()
 
+# External-content FTS5 table created by migration 0002
+STORIES_FTS = table("stories_fts", column("rowid"))
 
-def generate_story_number(db: Session, project_id: int) -> str:
-    """Generate next story number for a project (e.g., T&D-1001)"""
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
-    
-    # Get the highest story number for this project
-    stories = db.query(Story).filter(Story.project_id == project_id).all()
+
+async def _insert_sequence_row(db: AsyncSession, project_id: int, next_value: int) -> None:
+    """Create a project's counter row unless a concurrent request already did"""
+    if db.get_bind().dialect.name == "postgresql":
+        insert_stmt = postgresql.insert(StorySequence)
+    else:
+        insert_stmt = sqlite.insert(StorySequence)
+    await db.execute(
+        insert_stmt.values(project_id=project_id, next_value=next_value)
+        .on_conflict_do_nothing(index_elements=["project_id"])
+    )
+
+
+async def _legacy_next_value(db: AsyncSession, project_id: int) -> int:
+    """Seed a missing counter from numbers already handed out (one-time scan per project)"""
     max_number = 1000  # Start from 1001
-    
-    for story in stories:
-        if story.story_number:
-            try:
-                number_part = int(story.story_number.split('-')[1])
-                max_number = max(max_number, number_part)
-            except (IndexError, ValueError):
-                continue
-    
-    return f"{project.prefix}-{max_number + 1:04d}"
+    for story_number in await db.scalars(select(Story.story_number).where(Story.project_id == project_id)):
+        try:
+            max_number = max(max_number, int(story_number.rsplit('-', 1)[1]))
+        except (IndexError, ValueError):
+            continue
+    return max_number + 1
+
+
+async def reserve_story_numbers(db: AsyncSession, project: Project, count: int = 1) -> List[str]:
+    """Reserve `count` consecutive story numbers for a project (e.g., T&D-1001).
+
+    The counter is bumped with a single UPDATE ... RETURNING inside the caller's
+    transaction, so the row stays write-locked until the stories are committed and
+    concurrent workers can never mint the same number. Nothing is reserved if the
+    caller rolls back.
+    """
+    bump = (
+        update(StorySequence)
+        .where(StorySequence.project_id == project.id)
+        .values(next_value=StorySequence.next_value + count)
+        .returning(StorySequence.next_value)
+        .execution_options(synchronize_session=False)
+    )
+    next_value = (await db.execute(bump)).scalar_one_or_none()
+    if next_value is None:
+        await _insert_sequence_row(db, project.id, await _legacy_next_value(db, project.id))
+        next_value = (await db.execute(bump)).scalar_one()
+
+    return [f"{project.prefix}-{number:04d}" for number in range(next_value - count, next_value)]
+
+
+async def generate_story_number(db: AsyncSession, project: Project) -> str:
+    """Reserve the next story number for a project"""
+    return (await reserve_story_numbers(db, project))[0]
+
+
+# Sort tuples for keyset pagination, each backed by a (project_id, ..., id) index
+# on Story. Ids are assigned in creation order, so the trailing id both breaks ties
+# and stands in for created_at.
+STORY_SORT_KEYS = {
+    "created_at": (Story.id,),
+    "priority": (priority_rank, Story.id),
+    "story_points": (points_rank, Story.id),
+}
+
+STORY_SORT_VALUES = {
+    "created_at": lambda story: [story.id],
+    "priority": lambda story: [PRIORITY_RANKS.get(story.priority, UNRANKED_PRIORITY), story.id],
+    "story_points": lambda story: [story.story_points or 0, story.id],
+}
+
+
+# Columns a board card needs; the unbounded Text columns stay unloaded
+STORY_CARD_FIELDS = tuple(StoryCardResponse.model_fields)
+
+
+def story_view_options(view: str, entity=Story) -> list:
+    """Loader options that keep a `view=card` query to the card columns"""
+    if view == "card":
+        return [load_only(*(getattr(entity, field) for field in STORY_CARD_FIELDS), raiseload=True)]
+    return []
+
+
+def serialize_stories(stories, view: str) -> list:
+    model = StoryCardResponse if view == "card" else StoryResponse
+    return [model.model_validate(story) for story in stories]
+
+
+def story_cursor(story: Story, sort: str, order: str) -> str:
+    """Cursor that resumes a `sort`/`order` listing right after `story`"""
+    return encode_cursor({"s": sort, "o": order, "k": STORY_SORT_VALUES[sort](story)})
+
 
+async def paginate_stories(db: AsyncSession, statement, sort: str, order: str, limit: int, cursor: Optional[str] = None):
+    """Apply keyset ordering to a story select and return (page, next_cursor)"""
+    keys = STORY_SORT_KEYS[sort]
+    descending = order == "desc"
 
-@router.get("/stories", response_model=List[StoryResponse])
-def get_stories(
+    if cursor:
+        payload = decode_cursor(cursor)
+        values = payload.get("k")
+        if (payload.get("s") != sort or payload.get("o") != order
+                or not isinstance(values, list) or len(values) != len(keys)
+                or not all(isinstance(value, int) for value in values)):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor does not match the requested sort"
+            )
+        statement = statement.where(keyset_after(keys, values, descending))
+
+    statement = statement.order_by(*(key.desc() if descending else key.asc() for key in keys))
+    stories = (await db.scalars(statement.limit(limit + 1))).all()
+
+    next_cursor = None
+    if len(stories) > limit:
+        stories = stories[:limit]
+        next_cursor = story_cursor(stories[-1], sort, order)
+    return stories, next_cursor
+
+
+def filter_stories(
+    query,
     project_id: Optional[int] = None,
     status: Optional[str] = None,
     assignee_id: Optional[int] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    sprint_id: Optional[int] = None
 ):
-    query = db.query(Story)
-    
-    if project_id:
+    # `is not None`, not truthiness: an id of 0 must filter (to nothing), never widen
+    if project_id is not None:
         query = query.filter(Story.project_id == project_id)
-    if status:
+    if status is not None:
         query = query.filter(Story.status == status)
-    if assignee_id:
+    if assignee_id is not None:
         query = query.filter(Story.assignee_id == assignee_id)
-    
-    stories = query.all()
-    return stories
+    if sprint_id is not None:
+        query = query.filter(Story.sprint_id == sprint_id)
+    return query
+
+
+@router.get("/stories", response_model=List[Union[StoryResponse, StoryCardResponse]])
+async def get_stories(
+    response: Response,
+    project_id: Optional[int] = None,
+    status: Optional[str] = None,
+    assignee_id: Optional[int] = None,
+    sprint_id: Optional[int] = None,
+    sort: Literal["created_at", "priority", "story_points"] = "created_at",
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    cursor: Optional[str] = None,
+    view: Literal["full", "card"] = "full",
+    db: AsyncSession = Depends(get_read_db),
+    current_user: TokenPrincipal = Depends(get_token_principal)
+):
+    statement = select(Story).options(*story_view_options(view))
+    statement = filter_stories(statement, project_id, status, assignee_id, sprint_id)
+    stories, next_cursor = await paginate_stories(db, statement, sort, order, limit, cursor)
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return serialize_stories(stories, view)
+
+
+def _require_search_index(db: AsyncSession) -> None:
+    if db.get_bind().dialect.name != "sqlite":
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Story search requires the SQLite FTS5 index"
+        )
+
+
+# "T&D-1001": the tokenizer splits it into T, D and 1001, which as separate prefix
+# terms would match any story mentioning a T word, a D word and 1001
+STORY_NUMBER_QUERY = re.compile(r"[^\s-]+-\d+")
+
+
+def _match_expression(q: str) -> str:
+    """Turn free text into a safe FTS5 query: every word must match, as a prefix.
+
+    A story number (or the start of one) is matched as one phrase in the
+    story_number column instead.
+    """
+    terms = re.findall(r"\w+", q)
+    if terms and STORY_NUMBER_QUERY.fullmatch(q.strip()):
+        return f'story_number : "{" ".join(terms)}"*'
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+@router.get("/stories/search", response_model=List[StorySearchResult])
+async def search_stories(
+    q: str = Query(..., min_length=1),
+    project_id: Optional[int] = None,
+    status: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: TokenPrincipal = Depends(get_token_principal)
+):
+    """Full-text search over title, description, acceptance criteria and story number"""
+    _require_search_index(db)
+    match = _match_expression(q)
+    if not match:
+        return []
+
+    # bm25() is lower-is-better; titles and story numbers weigh more than body text
+    bm25 = literal_column("bm25(stories_fts, 10.0, 1.0, 1.0, 5.0)")
+    snippet = literal_column("snippet(stories_fts, -1, '[', ']', '…', 12)")
+    statement = select(Story, snippet, bm25).join(
+        STORIES_FTS, STORIES_FTS.c.rowid == Story.id
+    ).where(text("stories_fts MATCH :match").bindparams(match=match))
+    statement = filter_stories(statement, project_id, status)
+
+    # The story whose number is exactly q comes first, then the rest by relevance
+    exact_number = func.upper(Story.story_number) == q.strip().upper()
+    return [
+        StorySearchResult.model_validate(story).model_copy(update={"snippet": excerpt, "score": -rank})
+        for story, excerpt, rank in await db.execute(statement.order_by(exact_number.desc(), bm25).limit(limit))
+    ]
+
+
+EXPORT_COLUMNS = [column.key for column in Story.__table__.columns]
+EXPORT_BATCH_SIZE = 1000
+
+
+def _export_value(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def _stream_export(statement, export_format: str):
+    """Yield the export one batch at a time from a server-side cursor.
+
+    Runs on its own session: the request's session may already be closed by the
+    time the response body is streamed.
+    """
+    async with read_session() as db:
+        result = await db.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+            async for rows in result.partitions():
+                writer.writerows([_export_value(value) for value in row] for row in rows)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        else:
+            async for rows in result.partitions():
+                yield "".join(
+                    json.dumps(dict(zip(EXPORT_COLUMNS, map(_export_value, row)))) + "\n"
+                    for row in rows
+                )
+
+
+@router.get("/stories/export")
+async def export_stories(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    project_id: Optional[int] = None,
+    # An enum, so a bad value is a 422 before the stream starts instead of an error mid-body
+    status: Optional[StoryStatus] = None,
+    assignee_id: Optional[int] = None,
+    sprint_id: Optional[int] = None,
+    current_user: TokenPrincipal = Depends(get_token_principal)
+):
+    """Stream every matching story as NDJSON or CSV with constant memory"""
+    statement = select(*Story.__table__.columns).order_by(Story.id)
+    statement = filter_stories(statement, project_id, status, assignee_id, sprint_id)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_export(statement, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="stories.{format}"'}
+    )
 
 
 @router.get("/stories/{story_id}", response_model=StoryResponse)
-def get_story(
+async def get_story(
     story_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: TokenPrincipal = Depends(get_token_principal)
 ):
-    story = db.query(Story).filter(Story.id == story_id).first()
+    story = await db.get(Story, story_id)
     if not story:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -72,21 +322,28 @@ def get_story(
 
 
 @router.post("/stories", response_model=StoryResponse)
-def create_story(
+async def create_story(
     story_data: StoryCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     # Verify project exists
-    project = db.query(Project).filter(Project.id == story_data.project_id).first()
+    project = await db.get(Project, story_data.project_id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
+
+    _, errors = await _validate_bulk_items(db, {0: story_data})
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=errors[0][1]
+        )
     
-    # Generate story number
-    story_number = generate_story_number(db, story_data.project_id)
+    # Reserve story number (committed together with the story)
+    story_number = await generate_story_number(db, project)
     
     db_story = Story(
         story_number=story_number,
@@ -105,44 +362,195 @@ def create_story(
     )
     
     db.add(db_story)
-    db.commit()
-    db.refresh(db_story)
+    await db.commit()
+    await db.refresh(db_story)
     
     return db_story
 
 
+async def _validate_bulk_items(db: AsyncSession, items: Dict[int, StoryCreate]):
+    """Check the references of every item (by request index) with one IN query per table.
+
+    Returns the projects by id and a list of (index, detail) errors.
+    """
+    project_ids = {item.project_id for item in items.values()}
+    assignee_ids = {item.assignee_id for item in items.values() if item.assignee_id is not None}
+    sprint_ids = {item.sprint_id for item in items.values() if item.sprint_id is not None}
+
+    projects = {project.id: project for project in await db.scalars(select(Project).where(Project.id.in_(project_ids)))}
+    assignees = set()
+    if assignee_ids:
+        assignees = set(await db.scalars(select(User.id).where(User.id.in_(assignee_ids))))
+    sprint_projects = {}
+    if sprint_ids:
+        sprint_projects = dict((await db.execute(
+            select(Sprint.id, Sprint.project_id).where(Sprint.id.in_(sprint_ids))
+        )).all())
+
+    errors = []
+    for index, item in items.items():
+        if item.project_id not in projects:
+            errors.append((index, "Project not found"))
+        elif item.assignee_id is not None and item.assignee_id not in assignees:
+            errors.append((index, "Assignee not found"))
+        elif item.sprint_id is not None and sprint_projects.get(item.sprint_id) != item.project_id:
+            errors.append((index, "Sprint not found in this project"))
+    return projects, errors
+
+
+async def _validate_story_changes(db: AsyncSession, changes: Dict, scope):
+    """Check the assignee and sprint a patch sets, with one query each, before the UPDATE
+
+    `scope` is the UPDATE's WHERE clause: every story it matches has to be in the sprint's project.
+    """
+    if changes.get("assignee_id") is not None:
+        if not await db.scalar(select(User.id).where(User.id == changes["assignee_id"])):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Assignee not found"
+            )
+    if changes.get("sprint_id") is not None:
+        elsewhere = select(Story.id).where(scope, Story.project_id != Sprint.project_id)
+        if not await db.scalar(select(Sprint.id).where(Sprint.id == changes["sprint_id"], ~elsewhere.exists())):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Sprint not found in the project of every story"
+            )
+
+
+@router.post("/stories/bulk", response_model=StoryBulkCreateResponse)
+async def create_stories_bulk(
+    bulk_data: StoryBulkCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Create many stories in one transaction with one multi-row INSERT"""
+    items = {}
+    errors = []
+    for index, raw_item in enumerate(bulk_data.stories):
+        try:
+            items[index] = StoryCreate.model_validate(raw_item)
+        except ValidationError as error:
+            errors.append((index, validation_error_detail(error)))
+
+    projects, reference_errors = await _validate_bulk_items(db, items) if items else ({}, [])
+    errors = [{"index": index, "detail": detail} for index, detail in sorted(errors + reference_errors)]
+    if errors and bulk_data.mode == "atomic":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=errors
+        )
+
+    invalid = {error["index"] for error in errors}
+    valid_items = [item for index, item in items.items() if index not in invalid]
+    if not valid_items:
+        return {"created": [], "errors": errors}
+
+    # One contiguous block of numbers per project, handed out in request order
+    numbers = {}
+    for project_id in dict.fromkeys(item.project_id for item in valid_items):
+        count = sum(1 for item in valid_items if item.project_id == project_id)
+        numbers[project_id] = iter(await reserve_story_numbers(db, projects[project_id], count))
+
+    rows = [
+        {**item.model_dump(), "story_number": next(numbers[item.project_id]), "created_by": current_user.id}
+        for item in valid_items
+    ]
+    stories = (await db.scalars(insert(Story).returning(Story, sort_by_parameter_order=True), rows)).all()
+
+    created = [StoryResponse.model_validate(story) for story in stories]
+    await db.commit()
+
+    return {"created": created, "errors": errors}
+
+
+@router.patch("/stories/bulk", response_model=StoryBulkUpdateResponse)
+async def update_stories_bulk(
+    bulk_data: StoryBulkUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Apply one patch to many stories with a single UPDATE ... WHERE ... RETURNING"""
+    changes = bulk_data.changes.model_dump(exclude_unset=True)
+    if not changes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No changes given"
+        )
+
+    statement = update(Story).values(**changes)
+    if bulk_data.ids is not None and bulk_data.filter is None:
+        if len(bulk_data.ids) > settings.max_bulk_items:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {settings.max_bulk_items} stories per request"
+            )
+        statement = statement.where(Story.id.in_(bulk_data.ids))
+    elif bulk_data.filter is not None and bulk_data.ids is None:
+        statement = filter_stories(statement, **bulk_data.filter.model_dump(exclude_none=True))
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Give either ids or filter"
+        )
+
+    if statement.whereclause is None:
+        # Never turn an empty filter into an update of every story
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Filter needs at least one criterion"
+        )
+    await _validate_story_changes(db, changes, statement.whereclause)
+
+    updated = (await db.execute(
+        statement.returning(Story.id, Story.updated_at).execution_options(synchronize_session=False)
+    )).all()
+    await db.commit()
+
+    return {
+        "count": len(updated),
+        "updated": [{"id": story_id, "updated_at": updated_at} for story_id, updated_at in updated],
+    }
+
+
 @router.put("/stories/{story_id}", response_model=StoryResponse)
-def update_story(
+@router.patch("/stories/{story_id}", response_model=StoryResponse)
+async def update_story(
     story_id: int,
     story_data: StoryUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    story = db.query(Story).filter(Story.id == story_id).first()
+    update_data = story_data.model_dump(exclude_unset=True)
+
+    if update_data:
+        await _validate_story_changes(db, update_data, Story.id == story_id)
+        # Only the sent columns, one statement, updated row straight from RETURNING
+        story = (await db.scalars(
+            update(Story).where(Story.id == story_id).values(**update_data).returning(Story)
+        )).first()
+    else:
+        story = await db.get(Story, story_id)
+
     if not story:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Story not found"
         )
-    
-    update_data = story_data.dict(exclude_unset=True)
-    
-    for field, value in update_data.items():
-        setattr(story, field, value)
-    
-    db.commit()
-    db.refresh(story)
-    
-    return story
+
+    updated_story = StoryResponse.model_validate(story)
+    await db.commit()
+
+    return updated_story
 
 
 @router.delete("/stories/{story_id}")
-def delete_story(
+async def delete_story(
     story_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    story = db.query(Story).filter(Story.id == story_id).first()
+    story = await db.get(Story, story_id)
     if not story:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -157,7 +565,7 @@ def delete_story(
             detail="Not enough permissions to delete this story"
         )
     
-    db.delete(story)
-    db.commit()
+    await db.delete(story)
+    await db.commit()
     
     return {"message": "Story deleted successfully"}
\ No newline at end of file
@@ -1,36 +1,96 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import io
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from ..core.database import get_db
-from ..core.auth import get_current_user, get_admin_user
-from ..core.security import get_password_hash
+from typing import List, Optional
+from ..core.config import settings
+from ..core.database import get_async_db, get_read_db, get_db
+from ..core.auth import TokenPrincipal, get_current_user, get_token_principal, get_admin_user, invalidate_api_keys, invalidate_principal
+from ..core.hashing import password_hasher
+from ..core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
 from ..models.user import User
-from ..schemas.user import UserResponse, UserCreate, UserUpdate
+from ..schemas.user import UserResponse, UserCreate, UserUpdate, UserImportResponse
+from ..user_import import import_users
 
 router = APIRouter()
 
 
+def _prefix_match(db: AsyncSession, expression, prefix: str):
+    """`expression` starts with `prefix`, written so the lower() indexes apply"""
+    if db.get_bind().dialect.name == "sqlite":
+        # SQLite only uses a BINARY index for LIKE under case_sensitive_like, but always for ranges
+        return and_(expression >= prefix, expression < prefix + "\U0010ffff")
+    return expression.startswith(prefix, autoescape=True)
+
+
+async def search_users(db: AsyncSession, q: str, limit: int) -> List[User]:
+    """Users whose username, full name or email starts with `q`, best matches first"""
+    prefix = q.strip().lower()
+    username = func.lower(User.username)
+    full_name = func.lower(User.full_name)
+    email = func.lower(User.email)
+
+    relevance = case(
+        (username == prefix, 0),
+        (_prefix_match(db, username, prefix), 1),
+        (_prefix_match(db, full_name, prefix), 2),
+        else_=3,
+    )
+    return (await db.scalars(
+        select(User)
+        .where(or_(
+            _prefix_match(db, username, prefix),
+            _prefix_match(db, full_name, prefix),
+            _prefix_match(db, email, prefix),
+        ))
+        .order_by(relevance, username, User.id)
+        .limit(limit)
+    )).all()
+
+
 @router.get("/users", response_model=List[UserResponse])
-def get_users(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_user)
+async def get_users(
+    response: Response,
+    q: Optional[str] = Query(None, min_length=1),
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: TokenPrincipal = Depends(get_admin_user)
 ):
-    users = db.query(User).all()
+    """Directory in id order, paged by cursor; with `q`, a capped typeahead instead"""
+    if q and q.strip():
+        return await search_users(db, q, min(limit, settings.user_typeahead_limit))
+
+    statement = select(User)
+    if cursor:
+        after_id = decode_cursor(cursor).get("id")
+        if not isinstance(after_id, int):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        statement = statement.where(User.id > after_id)
+
+    users = (await db.scalars(statement.order_by(User.id).limit(limit + 1))).all()
+    if len(users) > limit:
+        users = users[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor({"id": users[-1].id})
     return users
 
 
 @router.get("/users/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: User = Depends(get_current_user)):
     return current_user
 
 
 @router.get("/users/{user_id}", response_model=UserResponse)
-def get_user(
+async def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: TokenPrincipal = Depends(get_token_principal)
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -40,26 +100,26 @@ def get_user(
 
 
 @router.post("/users", response_model=UserResponse)
-def create_user(
+async def create_user(
     user_data: UserCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenPrincipal = Depends(get_admin_user)
 ):
     # Check if username exists
-    if db.query(User).filter(User.username == user_data.username).first():
+    if await db.scalar(select(User.id).where(User.username == user_data.username)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already exists"
         )
     
     # Check if email exists
-    if db.query(User).filter(User.email == user_data.email).first():
+    if await db.scalar(select(User.id).where(User.email == user_data.email)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already exists"
         )
     
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await password_hasher.hash_async(user_data.password)
     db_user = User(
         username=user_data.username,
         email=user_data.email,
@@ -69,20 +129,40 @@ def create_user(
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
 
+@router.post("/users/import", response_model=UserImportResponse)
+def import_users_csv(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: TokenPrincipal = Depends(get_admin_user)
+):
+    """Create users from an uploaded CSV; invalid rows are reported, not fatal.
+
+    Stays a sync handler on a sync session: the import shares its code with the CLI.
+    """
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return import_users(db, lines)
+    except ValueError as error:  # Missing columns or not UTF-8
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+
+
 @router.put("/users/{user_id}", response_model=UserResponse)
-def update_user(
+async def update_user(
     user_id: int,
     user_data: UserUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenPrincipal = Depends(get_admin_user)
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -90,34 +170,44 @@ def update_user(
         )
     
     update_data = user_data.dict(exclude_unset=True)
+    previous_username = user.username
     
     # Handle password hashing if password is being updated
     if "password" in update_data:
-        update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+        update_data["hashed_password"] = await password_hasher.hash_async(update_data.pop("password"))
     
     for field, value in update_data.items():
         setattr(user, field, value)
     
-    db.commit()
-    db.refresh(user)
+    # Credentials and claims changed: revoke tokens issued before this update
+    if update_data.keys() & {"hashed_password", "role", "username"}:
+        user.token_version = User.token_version + 1
+    
+    await db.commit()
+    await db.refresh(user)
+    invalidate_principal(user.id, previous_username, user.username)
+    await invalidate_api_keys(db, user.id)
     
     return user
 
 
 @router.delete("/users/{user_id}")
-def delete_user(
+async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenPrincipal = Depends(get_admin_user)
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    db.delete(user)
-    db.commit()
+    username = user.username
+    await invalidate_api_keys(db, user_id)
+    await db.delete(user)
+    await db.commit()
+    invalidate_principal(user_id, username)
     
     return {"message": "User deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""Pick a bcrypt cost factor for this host.
+
+Times bcrypt at a cheap cost, extrapolates (each extra round doubles the work),
+then confirms the pick with a real measurement and prints the setting to use:
+
+    cd backend && python -m app.calibrate_bcrypt --target-ms 250
+
+Existing hashes are upgraded on each user's next login once BCRYPT_ROUNDS changes.
+"""
+import argparse
+import statistics
+import time
+from passlib.hash import bcrypt
+
+MIN_ROUNDS = 4
+MAX_ROUNDS = 31
+PROBE_ROUNDS = 8
+
+
+def measure(rounds: int, samples: int) -> float:
+    """Median seconds per hash at `rounds`"""
+    handler = bcrypt.using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        handler.hash("calibration-password")
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, floor: int, samples: int = 5) -> tuple:
+    """Highest cost whose hash time stays within `target_ms`, but never below `floor`"""
+    per_round = measure(PROBE_ROUNDS, samples) / 2 ** PROBE_ROUNDS
+    rounds = PROBE_ROUNDS
+    while rounds < MAX_ROUNDS and per_round * 2 ** (rounds + 1) * 1000 <= target_ms:
+        rounds += 1
+    while rounds > MIN_ROUNDS and per_round * 2 ** rounds * 1000 > target_ms:
+        rounds -= 1
+
+    rounds = max(rounds, floor)
+    elapsed = measure(rounds, max(1, samples // 2))
+    # The estimate can be off by a round on noisy hosts; correct once with the real number
+    if elapsed * 1000 > target_ms * 1.5 and rounds > floor:
+        rounds -= 1
+        elapsed = measure(rounds, max(1, samples // 2))
+    return rounds, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target-ms", type=float, default=250, help="hash time to aim for per login")
+    parser.add_argument("--min-rounds", type=int, default=10, help="never recommend less than this")
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+
+    rounds, elapsed = calibrate(args.target_ms, args.min_rounds, args.samples)
+    print(f"bcrypt cost {rounds}: {elapsed * 1000:.0f} ms per hash (target {args.target_ms:.0f} ms)")
+    print(f"Add to backend/.env:\n\nBCRYPT_ROUNDS={rounds}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,172 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from ..core.database import get_db
-from ..core.security import verify_token
+from dataclasses import dataclass
+from datetime import datetime
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import APIKeyHeader, HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..core.database import get_async_db
+from ..core.security import decode_token, hash_api_key
+from ..models.api_key import ApiKey
 from ..models.user import User, UserRole
-from typing import List
+from typing import List, Optional
 
-security = HTTPBearer()
+# Either credential may be sent; the dependencies below reject requests with neither
+security = HTTPBearer(auto_error=False)
+api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
+# Methods an API key with only the "read" scope may call
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    token = credentials.credentials
-    username = verify_token(token)
-    if username is None:
+# Authenticated users by username, and API keys by ("api_key", digest), detached from any session
+principal_cache = TTLCache(settings.principal_cache_size, settings.principal_cache_ttl_seconds)
+
+# Current token_version by user id; tokens carrying an older version are revoked
+token_versions = TTLCache(settings.principal_cache_size, settings.principal_cache_ttl_seconds)
+
+
+@dataclass(frozen=True)
+class TokenPrincipal:
+    """Caller identity taken from verified token claims, without loading the user"""
+    id: int
+    username: str
+    role: UserRole
+    token_version: int
+
+
+def token_claims(user: User) -> dict:
+    """Claims that let get_token_principal authorize without a user lookup"""
+    return {"uid": user.id, "role": user.role.value, "ver": user.token_version}
+
+
+def invalidate_principal(user_id: int, *usernames: str) -> None:
+    """Drop cached state for a user after it was changed or deleted"""
+    token_versions.pop(user_id)
+    for username in usernames:
+        principal_cache.pop(username)
+
+
+async def invalidate_api_keys(db: AsyncSession, user_id: int) -> None:
+    """Drop cached API keys of a user whose role or account changed"""
+    for digest in await db.scalars(select(ApiKey.key_digest).where(ApiKey.user_id == user_id)):
+        principal_cache.pop(("api_key", digest))
+
+
+def _not_authenticated() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Not authenticated"
+    )
+
+
+def _credentials_error(detail: str = "Could not validate credentials") -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def current_token_version(db: AsyncSession, user_id: int) -> Optional[int]:
+    """Latest token_version of a user (None if the user is gone), cached per process"""
+    version = token_versions.get(user_id)
+    if version is None:
+        version = await db.scalar(select(User.token_version).where(User.id == user_id))
+        if version is None:
+            return None
+        token_versions.set(user_id, version)
+    return version
+
+
+async def get_api_key_user(request: Request, api_key: str, db: AsyncSession) -> User:
+    """Service account behind an API key: one indexed lookup, then served from the cache"""
+    digest = hash_api_key(api_key)
+    entry = principal_cache.get(("api_key", digest))
+    if entry is None:
+        row = (await db.execute(
+            select(ApiKey, User).join(User, ApiKey.user_id == User.id).where(
+                ApiKey.key_digest == digest, ApiKey.revoked_at.is_(None)
+            )
+        )).first()
+        if row is None:
+            raise _credentials_error("Invalid API key")
+        key, user = row
+        db.expunge(user)
+        entry = (frozenset(key.scopes.split()), key.expires_at, user)
+        principal_cache.set(("api_key", digest), entry)
+
+    scopes, expires_at, user = entry
+    if expires_at is not None and expires_at <= datetime.utcnow():
+        raise _credentials_error("API key has expired")
+    required = "read" if request.method in READ_METHODS else "write"
+    if required not in scopes:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"API key lacks the {required} scope"
         )
-    
-    user = db.query(User).filter(User.username == username).first()
+    return user
+
+
+async def get_current_user(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    api_key: Optional[str] = Depends(api_key_header),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    if credentials is None:
+        if api_key is None:
+            raise _not_authenticated()
+        return await get_api_key_user(request, api_key, db)
+
+    claims = decode_token(credentials.credentials)
+    username = claims.get("sub") if claims else None
+    if username is None:
+        raise _credentials_error()
+
+    user = principal_cache.get(username)
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        user = await db.scalar(select(User).where(User.username == username))
+        if user is None:
+            raise _credentials_error("User not found")
+        # Detach so later commits in this session can't expire the shared copy
+        db.expunge(user)
+        principal_cache.set(username, user)
+
+    if claims.get("ver", user.token_version) != user.token_version:
+        raise _credentials_error("Token has been revoked")
     return user
 
 
+async def get_token_principal(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    api_key: Optional[str] = Depends(api_key_header),
+    db: AsyncSession = Depends(get_async_db)
+) -> TokenPrincipal:
+    """Authorize from the token alone; only the token_version check may touch the database"""
+    if credentials is None:
+        if api_key is None:
+            raise _not_authenticated()
+        user = await get_api_key_user(request, api_key, db)
+        return TokenPrincipal(user.id, user.username, user.role, user.token_version)
+
+    claims = decode_token(credentials.credentials)
+    if claims is None or "sub" not in claims:
+        raise _credentials_error()
+
+    if not {"uid", "role", "ver"} <= claims.keys():
+        # Token issued before claims were added
+        user = await get_current_user(request, credentials, None, db)
+        return TokenPrincipal(user.id, user.username, user.role, user.token_version)
+
+    if await current_token_version(db, claims["uid"]) != claims["ver"]:
+        raise _credentials_error("Token has been revoked")
+    return TokenPrincipal(claims["uid"], claims["sub"], UserRole(claims["role"]), claims["ver"])
+
+
 def require_roles(allowed_roles: List[UserRole]):
-    def role_checker(current_user: User = Depends(get_current_user)) -> User:
+    async def role_checker(current_user: TokenPrincipal = Depends(get_token_principal)) -> TokenPrincipal:
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -44,11 +177,13 @@ def require_roles(allowed_roles: List[UserRole]):
 
 
 # Convenience functions
-def get_admin_user(current_user: User = Depends(require_roles([UserRole.ADMIN]))) -> User:
+async def get_admin_user(
+    current_user: TokenPrincipal = Depends(require_roles([UserRole.ADMIN]))
+) -> TokenPrincipal:
     return current_user
 
 
-def get_admin_or_team_lead_user(
-    current_user: User = Depends(require_roles([UserRole.ADMIN, UserRole.TEAM_LEAD]))
-) -> User:
-    return current_user
\ No newline at end of file
+async def get_admin_or_team_lead_user(
+    current_user: TokenPrincipal = Depends(require_roles([UserRole.ADMIN, UserRole.TEAM_LEAD]))
+) -> TokenPrincipal:
+    return current_user
@@ -6,10 +6,43 @@ class Settings(BaseSettings):
     app_name: str = "Project Management API"
     debug: bool = True
     database_url: str = "sqlite:///./project_management.db"
+    # See SQLITE_PRAGMA_PROFILES in core/database.py; sqlite_pragmas overrides single values
+    sqlite_pragma_profile: str = "production"
+    sqlite_pragmas: dict = {}
+    # Connection pool; None uses the backend's value from BACKEND_DEFAULTS in core/database.py
+    db_pool_size: Optional[int] = None
+    db_max_overflow: Optional[int] = None
+    db_pool_timeout: Optional[int] = None
+    db_pool_pre_ping: Optional[bool] = None
+    db_pool_recycle: Optional[int] = None
+    db_statement_timeout_ms: Optional[int] = None  # PostgreSQL only
+    # Read replicas for the list/detail endpoints; empty reads from database_url
+    database_read_urls: list = []
     secret_key: str = "your-secret-key-change-this-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    refresh_token_expire_days: int = 14
     cors_origins: list = ["http://localhost:3000", "http://localhost:5173"]
+    default_page_size: int = 100
+    max_page_size: int = 500
+    max_bulk_items: int = 1000
+    user_typeahead_limit: int = 20
+    # Per-process; changes made through another worker show up after the TTL
+    principal_cache_size: int = 10000
+    principal_cache_ttl_seconds: int = 60
+    token_cache_size: int = 10000
+    # bcrypt cost factor; pick one for this host with `python -m app.calibrate_bcrypt`
+    bcrypt_rounds: int = 12
+    # bcrypt pool: 0 workers means one per CPU; "process" or "thread" executor
+    password_hash_workers: int = 0
+    password_hash_queue_limit: int = 64
+    password_hash_executor: str = "process"
+    # Login throttling: "memory" is per process, "sqlite" shares counts across workers on a host
+    login_throttle_backend: str = "memory"
+    login_throttle_path: str = "./login_throttle.db"
+    login_attempts_per_username: int = 10
+    login_attempts_per_ip: int = 100
+    login_attempt_window_seconds: int = 300
 
     class Config:
         env_file = ".env"
@@ -1,15 +1,195 @@
-from sqlalchemy import create_engine
+import itertools
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from .config import settings
 
-engine = create_engine(
-    settings.database_url, 
-    connect_args={"check_same_thread": False}  # SQLite specific
-)
+# asyncio driver for each backend the API runs on
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
 
+# Pool and timeout settings used when the matching Settings.db_* value is None
+BACKEND_DEFAULTS = {
+    # Connections are cheap and local; busy_timeout (see the pragmas) is the lock wait
+    "sqlite": {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_pre_ping": False,
+        "pool_recycle": -1,
+        "statement_timeout_ms": None,
+    },
+    # Stay well under max_connections across workers; recycle before idle timeouts
+    # of proxies and managed hosts drop the connection
+    "postgresql": {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 30,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "statement_timeout_ms": 30000,
+    },
+}
+
+# PRAGMAs run on every new SQLite connection, by Settings.sqlite_pragma_profile
+SQLITE_PRAGMA_PROFILES = {
+    # SQLite's own defaults: rollback journal, readers block behind writers
+    "default": {},
+    # WAL lets board reads run alongside story writes; NORMAL sync is durable in WAL
+    # except for the last commits on power loss, never corrupting
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,  # ms to wait for a lock before "database is locked"
+        "cache_size": -64000,  # KiB when negative, i.e. 64 MB per connection
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    },
+}
+
+
+def sqlite_pragmas(profile: str, overrides: dict = None) -> dict:
+    if profile not in SQLITE_PRAGMA_PROFILES:
+        raise ValueError(f"Unknown SQLite pragma profile: {profile}")
+    return {**SQLITE_PRAGMA_PROFILES[profile], **(overrides or {})}
+
+
+def install_sqlite_pragmas(engine, pragmas: dict) -> None:
+    """Apply `pragmas` to every connection `engine` opens"""
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def normalize_database_url(database_url: str) -> URL:
+    """Parse `database_url`, accepting the postgres:// scheme hosting providers hand out"""
+    if database_url.startswith("postgres://"):
+        database_url = "postgresql://" + database_url[len("postgres://"):]
+    return make_url(database_url)
+
+
+def _is_memory_sqlite(url: URL) -> bool:
+    return url.database in (None, "", ":memory:")
+
+
+def engine_options(url: URL, is_async: bool = False) -> dict:
+    """create_engine() keyword arguments: Settings where set, else BACKEND_DEFAULTS"""
+    backend = url.get_backend_name()
+    if backend not in BACKEND_DEFAULTS:
+        raise ValueError(f"Unsupported database backend: {backend}")
+    defaults = BACKEND_DEFAULTS[backend]
+
+    def setting(name):
+        value = getattr(settings, f"db_{name}")
+        return defaults[name] if value is None else value
+
+    options = {"connect_args": {}}
+    if not (backend == "sqlite" and _is_memory_sqlite(url)):
+        # In-memory SQLite gets a single shared connection; there is no pool to size
+        options.update(
+            pool_size=setting("pool_size"),
+            max_overflow=setting("max_overflow"),
+            pool_timeout=setting("pool_timeout"),
+            pool_pre_ping=setting("pool_pre_ping"),
+            pool_recycle=setting("pool_recycle"),
+        )
+        if backend == "sqlite" and is_async:
+            # aiosqlite defaults to NullPool: a new connection and thread per checkout
+            options["poolclass"] = AsyncAdaptedQueuePool
+
+    statement_timeout_ms = setting("statement_timeout_ms")
+    if backend == "sqlite":
+        if not is_async:
+            options["connect_args"]["check_same_thread"] = False
+    elif statement_timeout_ms:
+        # Server-side cap so one runaway query can't pin a pooled connection
+        if is_async:
+            options["connect_args"]["server_settings"] = {"statement_timeout": str(statement_timeout_ms)}
+        else:
+            options["connect_args"]["options"] = f"-c statement_timeout={statement_timeout_ms}"
+    return options
+
+
+def create_db_engine(database_url: str = None) -> Engine:
+    url = normalize_database_url(database_url or settings.database_url)
+    db_engine = create_engine(url, **engine_options(url))
+    if db_engine.dialect.name == "sqlite":
+        install_sqlite_pragmas(db_engine, sqlite_pragmas(settings.sqlite_pragma_profile, settings.sqlite_pragmas))
+    return db_engine
+
+
+def async_database_url(database_url: str) -> URL:
+    """`database_url` with its driver swapped for the asyncio one"""
+    url = normalize_database_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    if backend == "postgresql" and "sslmode" in url.query:
+        # libpq spells it sslmode, asyncpg spells it ssl
+        url = url.difference_update_query(["sslmode"]).update_query_dict({"ssl": url.query["sslmode"]})
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+def create_async_db_engine(database_url: str = None, read_only: bool = False) -> AsyncEngine:
+    """Async engine for `database_url`; `read_only` makes the database refuse writes on its connections"""
+    url = async_database_url(database_url or settings.database_url)
+    db_engine = create_async_engine(url, **engine_options(url, is_async=True))
+    if db_engine.dialect.name == "sqlite":
+        pragmas = sqlite_pragmas(settings.sqlite_pragma_profile, settings.sqlite_pragmas)
+        if read_only:
+            # Last, so journal_mode and friends are still applied first
+            pragmas = {**pragmas, "query_only": "ON"}
+        install_sqlite_pragmas(db_engine.sync_engine, pragmas)
+    elif read_only:
+        # Every transaction starts as READ ONLY, so a stray write errors out
+        # instead of landing on the primary
+        db_engine = db_engine.execution_options(postgresql_readonly=True)
+    return db_engine
+
+
+def create_read_engines() -> list:
+    """Engines for get_read_db: one per replica URL, else a read-only one on the primary"""
+    if settings.database_read_urls:
+        return [create_async_db_engine(url, read_only=True) for url in settings.database_read_urls]
+    url = async_database_url(settings.database_url)
+    if url.get_backend_name() == "sqlite" and _is_memory_sqlite(url):
+        # A second engine would open a different, empty in-memory database
+        return [async_engine]
+    if url.get_backend_name() == "postgresql":
+        # Same pool as the writes; only the transactions are flagged read-only
+        return [async_engine.execution_options(postgresql_readonly=True)]
+    return [create_async_db_engine(read_only=True)]
+
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Used by the async route handlers; SessionLocal stays for scripts, migrations and the auth routes
+async_engine = create_async_db_engine()
+
+# Objects stay readable after commit: an expired attribute can't lazy-load outside the greenlet
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Reads may go to replicas, round-robin per session; they can trail the primary by
+# the replication lag, so anything that must see its own write uses get_async_db
+read_engines = create_read_engines()
+_next_read_engine = itertools.cycle(read_engines)
+
+# Never committed, so nothing to expire; never flushed, since nothing is written
+AsyncReadSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
@@ -18,4 +198,20 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def read_session() -> AsyncSession:
+    """A session on the next read engine"""
+    return AsyncReadSessionLocal(bind=next(_next_read_engine))
+
+
+async def get_read_db():
+    """Session for list and detail endpoints; writes through it fail"""
+    async with read_session() as db:
+        yield db
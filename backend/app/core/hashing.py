@@ -0,0 +1,125 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
+from .config import settings
+from .security import get_password_hash, verify_password
+
+
+class PasswordHasherBusy(Exception):
+    """Raised instead of queueing when the password pool is saturated"""
+
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated, bounded pool so it can't starve the request threadpool.
+
+    At most `workers` hashes run at once and at most `queue_limit` more wait;
+    anything beyond that is rejected immediately with PasswordHasherBusy.
+    """
+
+    def __init__(self, workers: int, queue_limit: int, use_processes: bool = True):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.use_processes = use_processes
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.use_processes:
+                        # spawn, not fork: forking a threaded server can copy held locks
+                        self._executor = ProcessPoolExecutor(
+                            self.workers, mp_context=multiprocessing.get_context("spawn")
+                        )
+                    else:
+                        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    def _submit(self, fn, *args, wait: bool = False) -> Future:
+        with self._lock:
+            if wait:
+                self._slot_freed.wait_for(lambda: self._in_flight < self.workers + self.queue_limit)
+            elif self._in_flight >= self.workers + self.queue_limit:
+                self.rejected += 1
+                raise PasswordHasherBusy()
+            self._in_flight += 1
+
+        started = time.perf_counter()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        future.add_done_callback(lambda _: self._finished(time.perf_counter() - started))
+        return future
+
+    def _finished(self, latency: float) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self.completed += 1
+            self._latency_total += latency
+            self._latency_max = max(self._latency_max, latency)
+            self._slot_freed.notify()
+
+    async def hash_async(self, password: str) -> str:
+        """Hash on the pool; the awaiting request holds no thread meanwhile"""
+        return await asyncio.wrap_future(self._submit(get_password_hash, password))
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(self._submit(verify_password, plain_password, hashed_password))
+
+    def hash_many(self, passwords: List[str]) -> List[str]:
+        """Hash a batch, e.g. for bulk imports.
+
+        Keeps at most `workers` of its own hashes in flight so logins can still
+        get a slot, and waits for room instead of raising PasswordHasherBusy.
+        """
+        hashes: List[Optional[str]] = [None] * len(passwords)
+        pending = deque()
+        for index, password in enumerate(passwords):
+            if len(pending) >= self.workers:
+                done_index, future = pending.popleft()
+                hashes[done_index] = future.result()
+            pending.append((index, self._submit(get_password_hash, password, wait=True)))
+        for done_index, future in pending:
+            hashes[done_index] = future.result()
+        return hashes
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "in_flight": self._in_flight,
+                "queue_depth": max(0, self._in_flight - self.workers),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "latency_ms_avg": self._latency_total * 1000 / self.completed if self.completed else 0.0,
+                "latency_ms_max": self._latency_max * 1000,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers or os.cpu_count() or 1,
+    queue_limit=settings.password_hash_queue_limit,
+    use_processes=settings.password_hash_executor == "process",
+)
@@ -0,0 +1,48 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict, Sequence
+from fastapi import HTTPException, status
+from sqlalchemy import and_, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """Pack a keyset position into an opaque, URL-safe token"""
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, ValueError):
+        payload = None
+    if not isinstance(payload, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return payload
+
+
+def keyset_after(keys: Sequence[Any], values: Sequence[Any], descending: bool = False):
+    """Predicate selecting rows strictly after `values` in `keys` order.
+
+    Rendered as `k1 >= v1 AND (k1, k2, ...) > (v1, v2, ...)`. It needs an index
+    on (equality filters..., *keys) to be cheap; then no page is sorted and every
+    page starts with a seek. PostgreSQL seeks on the whole row value. SQLite seeks
+    on the first key only (hence the separate bound, which it can also use when
+    k1 is an expression) and then skips the rows tied with v1 on it. A page
+    therefore costs at most one sort-key bucket, e.g. a project's High stories,
+    rather than growing with the page number.
+    """
+    if descending:
+        after = tuple_(*keys) < tuple_(*values)
+        leading = keys[0] <= values[0]
+    else:
+        after = tuple_(*keys) > tuple_(*values)
+        leading = keys[0] >= values[0]
+    return and_(leading, after) if len(keys) > 1 else after
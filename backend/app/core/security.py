@@ -1,14 +1,23 @@
+import hashlib
+import hmac
+import secrets
+import time
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Dict, Optional, Union
 from jose import jwt
 from passlib.context import CryptContext
+from .cache import TTLCache
 from .config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes made with any other cost report needs_update() and are redone on login
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
+
+# Verified claims by token digest, each entry kept until the token's own exp
+token_cache = TTLCache(settings.token_cache_size, settings.access_token_expire_minutes * 60)
 
 
 def create_access_token(
-    subject: Union[str, Any], expires_delta: timedelta = None
+    subject: Union[str, Any], expires_delta: timedelta = None, claims: Optional[Dict[str, Any]] = None
 ) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -16,11 +25,29 @@ def create_access_token(
         expire = datetime.utcnow() + timedelta(
             minutes=settings.access_token_expire_minutes
         )
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
 
+def create_refresh_token() -> str:
+    return secrets.token_urlsafe(32)
+
+
+def hash_refresh_token(token: str) -> str:
+    """Keyed digest stored and looked up instead of the refresh token itself"""
+    return hmac.new(settings.secret_key.encode(), token.encode(), hashlib.sha256).hexdigest()
+
+
+def create_api_key() -> str:
+    return "pm_" + secrets.token_urlsafe(32)
+
+
+def hash_api_key(key: str) -> str:
+    """Digest stored and looked up instead of the API key itself"""
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -29,11 +56,40 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def verify_token(token: str) -> Union[str, None]:
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with a different cost than Settings.bcrypt_rounds"""
+    return pwd_context.needs_update(hashed_password)
+
+
+def _decode_token_uncached(token: str) -> Union[Dict[str, Any], None]:
     try:
-        payload = jwt.decode(
+        return jwt.decode(
             token, settings.secret_key, algorithms=[settings.algorithm]
         )
-        return payload.get("sub")
     except jwt.JWTError:
-        return None
\ No newline at end of file
+        return None
+
+
+def decode_token(token: str) -> Union[Dict[str, Any], None]:
+    """Verified claims of a token, or None if it is invalid or expired.
+
+    A browser tab sends the same token on every request, so the signature check
+    runs once per token; later calls are a digest lookup until the token expires.
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+    # Bucket by prefix, then confirm the full digest in constant time
+    entry = token_cache.get(digest[:16])
+    if entry is not None and hmac.compare_digest(entry[0], digest):
+        return dict(entry[1])
+
+    payload = _decode_token_uncached(token)
+    if payload is not None:
+        lifetime = payload.get("exp", 0) - time.time()
+        if lifetime > 0:
+            token_cache.set(digest[:16], (digest, payload), ttl=lifetime)
+    return payload
+
+
+def verify_token(token: str) -> Union[str, None]:
+    payload = decode_token(token)
+    return payload.get("sub") if payload else None
\ No newline at end of file
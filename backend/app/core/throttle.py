@@ -0,0 +1,144 @@
+import random
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Optional
+from .config import settings
+
+
+class ThrottleBackend(ABC):
+    """Sliding-window attempt log shared by everything that uses the same backend"""
+
+    @abstractmethod
+    def hit(self, key: str, limit: int, window: float) -> float:
+        """Record an attempt for `key` if fewer than `limit` happened in the last
+        `window` seconds; return 0 when allowed, else seconds until a slot frees up"""
+
+    @abstractmethod
+    def reset(self, key: str) -> None:
+        """Forget every attempt recorded for `key`"""
+
+
+class MemoryThrottleBackend(ThrottleBackend):
+    """Per-process log; `max_keys` bounds memory when an attacker cycles usernames"""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._attempts: "OrderedDict[str, deque]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, window: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            attempts = self._attempts.get(key)
+            if attempts is None:
+                attempts = self._attempts[key] = deque()
+                while len(self._attempts) > self.max_keys:
+                    self._attempts.popitem(last=False)
+            self._attempts.move_to_end(key)
+
+            while attempts and attempts[0] <= now - window:
+                attempts.popleft()
+            if len(attempts) >= limit:
+                return attempts[0] + window - now
+            attempts.append(now)
+            return 0.0
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._attempts.pop(key, None)
+
+
+class SQLiteThrottleBackend(ThrottleBackend):
+    """Log kept in a local SQLite file so every worker on the host sees the same counts"""
+
+    PURGE_PROBABILITY = 0.01
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS login_attempts (key TEXT NOT NULL, at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_login_attempts_key_at ON login_attempts (key, at)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def hit(self, key: str, limit: int, window: float) -> float:
+        # Wall clock, since the timestamps are compared across processes
+        now = time.time()
+        connection = self._connect()
+        # IMMEDIATE takes the write lock up front so count-then-insert is atomic
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if random.random() < self.PURGE_PROBABILITY:
+                # Now and then also drop stale rows of keys that were never hit again
+                connection.execute("DELETE FROM login_attempts WHERE at <= ?", (now - window,))
+            else:
+                connection.execute(
+                    "DELETE FROM login_attempts WHERE key = ? AND at <= ?", (key, now - window)
+                )
+            count, oldest = connection.execute(
+                "SELECT COUNT(*), MIN(at) FROM login_attempts WHERE key = ?", (key,)
+            ).fetchone()
+            if count >= limit:
+                retry_after = oldest + window - now
+            else:
+                connection.execute("INSERT INTO login_attempts (key, at) VALUES (?, ?)", (key, now))
+                retry_after = 0.0
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return retry_after
+
+    def reset(self, key: str) -> None:
+        self._connect().execute("DELETE FROM login_attempts WHERE key = ?", (key,))
+
+
+def create_throttle_backend() -> ThrottleBackend:
+    if settings.login_throttle_backend == "sqlite":
+        return SQLiteThrottleBackend(settings.login_throttle_path)
+    return MemoryThrottleBackend()
+
+
+class LoginThrottle:
+    """Caps login attempts per username and per client IP over a sliding window"""
+
+    def __init__(self, backend: ThrottleBackend, username_limit: int, ip_limit: int, window: float):
+        self.backend = backend
+        self.username_limit = username_limit
+        self.ip_limit = ip_limit
+        self.window = window
+
+    def check(self, username: str, client_ip: Optional[str]) -> float:
+        """Record an attempt; return 0 if it may proceed, else the Retry-After seconds"""
+        if client_ip:
+            retry_after = self.backend.hit(f"ip:{client_ip}", self.ip_limit, self.window)
+            if retry_after:
+                return retry_after
+        return self.backend.hit(f"user:{username.lower()}", self.username_limit, self.window)
+
+    def succeeded(self, username: str) -> None:
+        """A correct password clears the username's failures; the IP budget stays spent"""
+        self.backend.reset(f"user:{username.lower()}")
+
+
+login_throttle = LoginThrottle(
+    create_throttle_backend(),
+    username_limit=settings.login_attempts_per_username,
+    ip_limit=settings.login_attempts_per_ip,
+    window=settings.login_attempt_window_seconds,
+)
@@ -1,13 +1,16 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
+from .core.auth import TokenPrincipal, get_admin_user, principal_cache
 from .core.config import settings
-from .core.database import engine
-from .models import user, project, story, sprint  # Import all models
-from .api import auth, users, projects, stories, sprints
-
-# Create all tables
-user.Base.metadata.create_all(bind=engine)
+from .core.database import async_engine, read_engines
+from .core.hashing import PasswordHasherBusy, password_hasher
+from .core.pagination import NEXT_CURSOR_HEADER
+from .core.security import token_cache
+from .api import auth, users, projects, stories, sprints, api_keys
 
+# The schema is managed by `python -m app.migrate`; importing the app runs no DDL
 app = FastAPI(
     title=settings.app_name,
     debug=settings.debug
@@ -20,14 +23,43 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many concurrent password operations, retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(IntegrityError)
+async def integrity_error_handler(request: Request, exc: IntegrityError):
+    # Last line of defence: the handlers check references up front, but with
+    # foreign keys enforced a race (or a missed check) must not become a 500
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"detail": "The request references a missing record or duplicates an existing one"},
+    )
+
+
+@app.on_event("shutdown")
+async def shutdown_pools():
+    password_hasher.shutdown()
+    for db_engine in {async_engine, *read_engines}:
+        await db_engine.dispose()
+
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(users.router, prefix="/api", tags=["users"])
 app.include_router(projects.router, prefix="/api", tags=["projects"])
 app.include_router(stories.router, prefix="/api", tags=["stories"])
 app.include_router(sprints.router, prefix="/api", tags=["sprints"])
+app.include_router(api_keys.router, prefix="/api", tags=["api keys"])
 
 
 @app.get("/")
@@ -37,4 +69,14 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/metrics")
+def metrics(current_user: TokenPrincipal = Depends(get_admin_user)):
+    """Cache and password pool counters; admin only, since they reveal load and usage patterns"""
+    return {
+        "principal_cache": principal_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+    }
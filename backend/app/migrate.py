@@ -0,0 +1,47 @@
+"""Bring the database schema up to date.
+
+The API does no DDL on startup. Run this once per deploy, before the new
+workers start:
+
+    cd backend && python -m app.migrate            # apply pending revisions
+    cd backend && python -m app.migrate status     # list applied and pending revisions
+
+Revisions live in app/migrations. Index builds use CREATE INDEX CONCURRENTLY on
+PostgreSQL, so they don't block writes to a live database.
+"""
+import argparse
+import time
+from .core.database import engine
+from .migrations import applied_revisions, load_migrations, run_migrations
+
+
+def upgrade() -> None:
+    start = time.perf_counter()
+    ran = run_migrations(engine)
+    if ran:
+        print(f"✅ Applied {', '.join(ran)} in {time.perf_counter() - start:.1f} s")
+    else:
+        print("✅ Schema is up to date")
+
+
+def status() -> None:
+    applied = applied_revisions(engine)
+    for module in load_migrations():
+        state = "applied" if module.revision in applied else "pending"
+        print(f"{module.revision}  {state:<8} {(module.__doc__ or '').strip().splitlines()[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", nargs="?", choices=("upgrade", "status"), default="upgrade")
+    args = parser.parse_args()
+
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+    if args.command == "status":
+        status()
+    else:
+        upgrade()
+
+
+if __name__ == "__main__":
+    main()
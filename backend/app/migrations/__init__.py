@@ -0,0 +1,121 @@
+"""Versioned schema migrations.
+
+Every module in this package named ``v<NNNN>_<slug>.py`` defines a ``revision``
+string and an ``upgrade(engine)`` function. Applied revisions are recorded in the
+``schema_migrations`` table, so each step runs once per database, in order.
+Nothing runs at import time; apply them with ``python -m app.migrate``.
+
+Revision 0000 creates the tables from the current models. A fresh database
+therefore already has whatever the later revisions add, so every revision must
+check first (IF NOT EXISTS, or inspect the schema) instead of assuming the old
+layout.
+"""
+import importlib
+import pkgutil
+from contextlib import contextmanager
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.sql import func
+
+migration_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("revision", String, primary_key=True),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+
+def load_migrations():
+    """Import every migration module, ordered by revision"""
+    modules = [
+        importlib.import_module(f"{__name__}.{name}")
+        for _, name, _ in pkgutil.iter_modules(__path__)
+        if name.startswith("v")
+    ]
+    return sorted(modules, key=lambda module: module.revision)
+
+
+# Arbitrary key for pg_advisory_lock, shared by everything that runs migrations
+MIGRATION_LOCK_ID = 72_010_425
+
+
+def applied_revisions(engine: Engine) -> set:
+    if not inspect(engine).has_table(schema_migrations.name):
+        return set()
+    with engine.connect() as connection:
+        return set(connection.execute(select(schema_migrations.c.revision)).scalars())
+
+
+@contextmanager
+def migration_lock(engine: Engine):
+    """Serialize migration runs, e.g. when every release container runs migrate.
+
+    PostgreSQL holds a session-level advisory lock for the whole run. SQLite has
+    no equivalent; there every revision is idempotent and the IntegrityError on
+    recording covers concurrent runs.
+    """
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+        try:
+            yield
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+
+
+def run_migrations(engine: Engine) -> list:
+    """Apply pending migrations and return the revisions that ran"""
+    with migration_lock(engine):
+        migration_metadata.create_all(bind=engine)
+        applied = applied_revisions(engine)
+        ran = []
+
+        for module in load_migrations():
+            if module.revision in applied:
+                continue
+            module.upgrade(engine)
+            try:
+                with engine.begin() as connection:
+                    connection.execute(schema_migrations.insert().values(revision=module.revision))
+            except IntegrityError:
+                pass  # Another run recorded the same (idempotent) step first
+            ran.append(module.revision)
+
+    return ran
+
+
+def create_index_online(engine: Engine, index) -> None:
+    """Create `index` if missing without blocking writers where the backend allows it.
+
+    PostgreSQL builds it with CREATE INDEX CONCURRENTLY, which has to run outside a
+    transaction. SQLite has no online build; its short write lock still lets readers
+    through in WAL mode.
+    """
+    if engine.dialect.name == "postgresql":
+        options = index.dialect_options["postgresql"]
+        options["concurrently"] = True
+        try:
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                connection.execute(CreateIndex(index, if_not_exists=True))
+        finally:
+            # The Index belongs to the model metadata; don't leak the flag into create_all
+            options["concurrently"] = False
+    else:
+        with engine.begin() as connection:
+            connection.execute(CreateIndex(index, if_not_exists=True))
+
+
+def drop_index_online(engine: Engine, name: str) -> None:
+    """Drop the index `name` if present, with DROP INDEX CONCURRENTLY on PostgreSQL"""
+    if engine.dialect.name == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+    else:
+        with engine.begin() as connection:
+            connection.execute(text(f'DROP INDEX IF EXISTS "{name}"'))
@@ -0,0 +1,10 @@
+"""Tables, indexes and constraints as declared by the models"""
+from ..core.database import Base
+from .. import models  # noqa: F401 (registers every table)
+
+revision = "0000"
+
+
+def upgrade(engine):
+    # checkfirst: databases from before versioned migrations already have most tables
+    Base.metadata.create_all(bind=engine)
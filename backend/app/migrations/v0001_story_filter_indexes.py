@@ -0,0 +1,20 @@
+"""Composite indexes for the story list filters"""
+from . import create_index_online
+from ..models.story import Story
+
+revision = "0001"
+
+INDEXES = (
+    "ix_stories_project_status",
+    "ix_stories_assignee_status",
+    "ix_stories_sprint_status",
+    "ix_stories_project_updated",
+)
+
+
+def upgrade(engine):
+    indexes = {index.name: index for index in Story.__table__.indexes}
+    for name in INDEXES:
+        # ix_stories_project_status left the model in 0006; that revision drops it
+        if name in indexes:
+            create_index_online(engine, indexes[name])
@@ -0,0 +1,44 @@
+"""FTS5 index over story text, kept in sync by triggers (SQLite only)"""
+
+revision = "0002"
+
+STATEMENTS = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS stories_fts USING fts5(
+        title, description, acceptance_criteria, story_number,
+        content='stories', content_rowid='id', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS stories_fts_insert AFTER INSERT ON stories BEGIN
+        INSERT INTO stories_fts (rowid, title, description, acceptance_criteria, story_number)
+        VALUES (new.id, new.title, new.description, new.acceptance_criteria, new.story_number);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS stories_fts_delete AFTER DELETE ON stories BEGIN
+        INSERT INTO stories_fts (stories_fts, rowid, title, description, acceptance_criteria, story_number)
+        VALUES ('delete', old.id, old.title, old.description, old.acceptance_criteria, old.story_number);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS stories_fts_update
+    AFTER UPDATE OF title, description, acceptance_criteria, story_number ON stories BEGIN
+        INSERT INTO stories_fts (stories_fts, rowid, title, description, acceptance_criteria, story_number)
+        VALUES ('delete', old.id, old.title, old.description, old.acceptance_criteria, old.story_number);
+        INSERT INTO stories_fts (rowid, title, description, acceptance_criteria, story_number)
+        VALUES (new.id, new.title, new.description, new.acceptance_criteria, new.story_number);
+    END
+    """,
+    # Index the stories that already exist
+    "INSERT INTO stories_fts (stories_fts) VALUES ('rebuild')",
+)
+
+
+def upgrade(engine):
+    if engine.dialect.name != "sqlite":
+        return
+
+    with engine.begin() as connection:
+        for statement in STATEMENTS:
+            connection.exec_driver_sql(statement)
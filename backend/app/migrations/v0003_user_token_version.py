@@ -0,0 +1,15 @@
+"""users.token_version for revoking issued access tokens"""
+from sqlalchemy import inspect
+
+revision = "0003"
+
+
+def upgrade(engine):
+    columns = {column["name"] for column in inspect(engine).get_columns("users")}
+    if "token_version" in columns:
+        return
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "ALTER TABLE users ADD COLUMN token_version INTEGER NOT NULL DEFAULT 0"
+        )
@@ -0,0 +1,17 @@
+"""lower() expression indexes for the user directory typeahead"""
+from . import create_index_online
+from ..models.user import User
+
+revision = "0004"
+
+INDEXES = (
+    "ix_users_username_lower",
+    "ix_users_full_name_lower",
+    "ix_users_email_lower",
+)
+
+
+def upgrade(engine):
+    indexes = {index.name: index for index in User.__table__.indexes}
+    for name in INDEXES:
+        create_index_online(engine, indexes[name])
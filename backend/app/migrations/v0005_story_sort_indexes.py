@@ -0,0 +1,18 @@
+"""(project_id, sort key, id) indexes behind the keyset story sorts and the board"""
+from . import create_index_online
+from ..models.story import Story
+
+revision = "0005"
+
+INDEXES = (
+    "ix_stories_project_created",
+    "ix_stories_project_priority",
+    "ix_stories_project_status_priority",
+    "ix_stories_project_points",
+)
+
+
+def upgrade(engine):
+    indexes = {index.name: index for index in Story.__table__.indexes}
+    for name in INDEXES:
+        create_index_online(engine, indexes[name])
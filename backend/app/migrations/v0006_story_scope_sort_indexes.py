@@ -0,0 +1,27 @@
+"""Sort indexes for unscoped, assignee and sprint story lists; drop ix_stories_project_status"""
+from . import create_index_online, drop_index_online
+from ..models.story import Story
+
+revision = "0006"
+
+INDEXES = (
+    "ix_stories_assignee_created",
+    "ix_stories_assignee_priority",
+    "ix_stories_assignee_points",
+    "ix_stories_sprint_created",
+    "ix_stories_sprint_priority",
+    "ix_stories_sprint_points",
+    "ix_stories_priority",
+    "ix_stories_points",
+)
+
+# (project_id, status) is a prefix of ix_stories_project_status_priority
+DROPPED = ("ix_stories_project_status",)
+
+
+def upgrade(engine):
+    indexes = {index.name: index for index in Story.__table__.indexes}
+    for name in INDEXES:
+        create_index_online(engine, indexes[name])
+    for name in DROPPED:
+        drop_index_online(engine, name)
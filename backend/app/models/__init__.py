@@ -0,0 +1,6 @@
+"""ORM models.
+
+Importing any of them loads them all, so every table is on Base.metadata and
+relationship() can resolve its string targets before the mappers configure.
+"""
+from . import user, project, story, sprint, story_sequence, refresh_token, api_key  # noqa: F401
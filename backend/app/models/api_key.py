@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from ..core.database import Base
+
+
+class ApiKey(Base):
+    __tablename__ = "api_keys"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    key_digest = Column(String(64), unique=True, index=True, nullable=False)  # SHA-256, never the key
+    prefix = Column(String(12), nullable=False)  # First characters of the key, to tell keys apart
+    scopes = Column(String, nullable=False, default="read")  # Space-separated: "read", "write"
+
+    # Foreign Keys
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+
+    # Timestamps (naive UTC, compared against datetime.utcnow())
+    expires_at = Column(DateTime)
+    revoked_at = Column(DateTime)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    user = relationship("User", back_populates="api_keys")
@@ -20,4 +20,7 @@ class Project(Base):
     created_by_user = relationship("User", foreign_keys=[created_by], back_populates="created_projects")
     team_lead = relationship("User", foreign_keys=[team_lead_id])
     stories = relationship("Story", back_populates="project")
-    sprints = relationship("Sprint", back_populates="project")
\ No newline at end of file
+    sprints = relationship("Sprint", back_populates="project")
+    story_sequence = relationship(
+        "StorySequence", back_populates="project", uselist=False, cascade="all, delete-orphan"
+    )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum, Index, case, literal_column
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -54,4 +54,44 @@ class Story(Base):
     project = relationship("Project", back_populates="stories")
     assignee_user = relationship("User", foreign_keys=[assignee_id], back_populates="assigned_stories")
     created_by_user = relationship("User", foreign_keys=[created_by], back_populates="created_stories")
-    sprint = relationship("Sprint", back_populates="stories")
\ No newline at end of file
+    sprint = relationship("Sprint", back_populates="stories")
+
+    # Composite indexes matching the story list filters
+    __table_args__ = (
+        Index("ix_stories_assignee_status", "assignee_id", "status"),
+        Index("ix_stories_sprint_status", "sprint_id", "status"),
+        Index("ix_stories_project_updated", "project_id", "updated_at"),
+    )
+
+
+# Sort expressions of the story lists. Literals only, no bound parameters: the
+# ORDER BY then renders the same SQL as the indexes below, which is what lets
+# SQLite (and PostgreSQL) match them and walk the index instead of sorting
+PRIORITY_RANKS = {StoryPriority.HIGH: 0, StoryPriority.MEDIUM: 1, StoryPriority.LOW: 2}
+UNRANKED_PRIORITY = len(PRIORITY_RANKS)
+
+priority_rank = case(
+    *(
+        (Story.priority == literal_column(f"'{priority.name}'"), literal_column(str(rank)))
+        for priority, rank in PRIORITY_RANKS.items()
+    ),
+    else_=literal_column(str(UNRANKED_PRIORITY)),
+)
+points_rank = func.coalesce(Story.story_points, literal_column("0"))
+
+# One per filter and sort key, trailing id as the tie-breaker, so a story list
+# filtered by project, assignee or sprint (or not at all) walks an index in
+# order. The status variant also serves the board, which ranks each status
+# column by priority
+Index("ix_stories_project_created", Story.project_id, Story.id)
+Index("ix_stories_project_priority", Story.project_id, priority_rank, Story.id)
+Index("ix_stories_project_status_priority", Story.project_id, Story.status, priority_rank, Story.id)
+Index("ix_stories_project_points", Story.project_id, points_rank, Story.id)
+Index("ix_stories_assignee_created", Story.assignee_id, Story.id)
+Index("ix_stories_assignee_priority", Story.assignee_id, priority_rank, Story.id)
+Index("ix_stories_assignee_points", Story.assignee_id, points_rank, Story.id)
+Index("ix_stories_sprint_created", Story.sprint_id, Story.id)
+Index("ix_stories_sprint_priority", Story.sprint_id, priority_rank, Story.id)
+Index("ix_stories_sprint_points", Story.sprint_id, points_rank, Story.id)
+Index("ix_stories_priority", priority_rank, Story.id)
+Index("ix_stories_points", points_rank, Story.id)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy.orm import relationship
+from ..core.database import Base
+
+
+class StorySequence(Base):
+    __tablename__ = "story_sequences"
+
+    # One counter row per project; next_value is the number the next story will get
+    project_id = Column(Integer, ForeignKey("projects.id"), primary_key=True)
+    next_value = Column(Integer, nullable=False, default=1001)
+
+    # Relationships
+    project = relationship("Project", back_populates="story_sequence")
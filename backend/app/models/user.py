@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -20,11 +20,24 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     full_name = Column(String, nullable=False)
     role = Column(Enum(UserRole), default=UserRole.USER, nullable=False)
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)  # Bump to revoke issued tokens
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    created_projects = relationship("Project", back_populates="created_by_user")
-    assigned_stories = relationship("Story", back_populates="assignee_user")
+    created_projects = relationship("Project", foreign_keys="Project.created_by", back_populates="created_by_user")
+    assigned_stories = relationship("Story", foreign_keys="Story.assignee_id", back_populates="assignee_user")
     created_stories = relationship("Story", foreign_keys="Story.created_by", back_populates="created_by_user")
-    created_sprints = relationship("Sprint", back_populates="created_by_user")
\ No newline at end of file
+    created_sprints = relationship("Sprint", back_populates="created_by_user")
+    refresh_tokens = relationship("RefreshToken", back_populates="user", cascade="all, delete-orphan")
+    api_keys = relationship("ApiKey", back_populates="user", cascade="all, delete-orphan")
+
+    # Case-insensitive prefix lookups for the user directory typeahead
+    __table_args__ = (
+        Index("ix_users_username_lower", func.lower(username).label("username_lower"),
+              postgresql_ops={"username_lower": "text_pattern_ops"}),
+        Index("ix_users_full_name_lower", func.lower(full_name).label("full_name_lower"),
+              postgresql_ops={"full_name_lower": "text_pattern_ops"}),
+        Index("ix_users_email_lower", func.lower(email).label("email_lower"),
+              postgresql_ops={"email_lower": "text_pattern_ops"}),
+    )
\ No newline at end of file
@@ -0,0 +1,8 @@
+from pydantic import ValidationError
+
+
+def validation_error_detail(error: ValidationError) -> str:
+    """First problem of a failed validation as "field: message", for per-item error lists"""
+    first = error.errors()[0]
+    field = ".".join(str(part) for part in first["loc"])
+    return f"{field}: {first['msg']}" if field else first["msg"]
@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Literal, Optional
+from datetime import datetime
+
+
+class ApiKeyCreate(BaseModel):
+    name: str
+    user_id: int  # The service account the key acts as
+    # "read" allows GET requests, "write" everything else
+    scopes: List[Literal["read", "write"]] = ["read"]
+    expires_in_days: Optional[int] = Field(None, ge=1)
+
+
+class ApiKeyResponse(BaseModel):
+    id: int
+    name: str
+    prefix: str
+    scopes: List[str]
+    user_id: int
+    expires_at: Optional[datetime] = None
+    revoked_at: Optional[datetime] = None
+    created_at: datetime
+
+    @field_validator("scopes", mode="before")
+    @classmethod
+    def split_scopes(cls, value):
+        return value.split() if isinstance(value, str) else value
+
+    class Config:
+        from_attributes = True
+
+
+class ApiKeyCreated(ApiKeyResponse):
+    key: str  # Shown once; only its digest is stored
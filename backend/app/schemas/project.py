@@ -1,6 +1,8 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional, Union
 from datetime import datetime
+from ..models.story import StoryStatus
+from .story import StoryResponse, StoryCardResponse
 
 
 class ProjectBase(BaseModel):
@@ -28,4 +30,18 @@ class ProjectResponse(ProjectBase):
     updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class BoardColumn(BaseModel):
+    status: StoryStatus
+    count: int
+    story_points: int
+    stories: List[Union[StoryResponse, StoryCardResponse]]
+    next_cursor: Optional[str] = None  # Continue with GET /api/stories?sort=priority
+
+
+class ProjectBoardResponse(BaseModel):
+    project_id: int
+    sprint_id: Optional[int] = None
+    columns: List[BoardColumn]
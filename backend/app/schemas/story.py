@@ -1,6 +1,7 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import Any, Dict, List, Literal, Optional
 from datetime import datetime
+from ..core.config import settings
 from ..models.story import StoryStatus, StoryPriority, StoryType
 
 
@@ -33,6 +34,14 @@ class StoryUpdate(BaseModel):
     sprint_id: Optional[int] = None
     due_date: Optional[datetime] = None
 
+    @field_validator("title", "story_points", "status", "priority", "story_type")
+    @classmethod
+    def not_null(cls, value):
+        # Leaving a field out keeps it; these columns can't be cleared with an explicit null
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
 
 class StoryResponse(StoryBase):
     id: int
@@ -43,4 +52,69 @@ class StoryResponse(StoryBase):
     updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class StoryCardResponse(BaseModel):
+    """Board card projection: no description or acceptance criteria"""
+    id: int
+    story_number: str
+    title: str
+    story_points: Optional[int] = None
+    status: StoryStatus
+    priority: StoryPriority
+    story_type: StoryType
+    project_id: int
+    assignee_id: Optional[int] = None
+    sprint_id: Optional[int] = None
+    due_date: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class StorySearchResult(StoryResponse):
+    snippet: Optional[str] = None
+    score: float = 0.0
+
+
+class StoryBulkCreate(BaseModel):
+    # Raw items, each validated as a StoryCreate by the endpoint: in partial mode one
+    # malformed item must not turn the whole request into a 422
+    stories: List[Dict[str, Any]] = Field(..., max_length=settings.max_bulk_items)
+    # "atomic": any invalid item rejects the whole batch; "partial": skip invalid items
+    mode: Literal["atomic", "partial"] = "atomic"
+
+
+class StoryBulkError(BaseModel):
+    index: int
+    detail: str
+
+
+class StoryBulkCreateResponse(BaseModel):
+    created: List[StoryResponse]
+    errors: List[StoryBulkError] = []
+
+
+class StoryBulkFilter(BaseModel):
+    project_id: Optional[int] = Field(None, gt=0)
+    status: Optional[StoryStatus] = None
+    assignee_id: Optional[int] = Field(None, gt=0)
+    sprint_id: Optional[int] = Field(None, gt=0)
+
+
+class StoryBulkUpdate(BaseModel):
+    # Target either explicit ids or every story matching the filter
+    ids: Optional[List[int]] = None
+    filter: Optional[StoryBulkFilter] = None
+    changes: StoryUpdate
+
+
+class StoryBulkUpdated(BaseModel):
+    id: int
+    updated_at: Optional[datetime] = None
+
+
+class StoryBulkUpdateResponse(BaseModel):
+    count: int
+    updated: List[StoryBulkUpdated]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from ..models.user import UserRole
 
@@ -32,9 +32,24 @@ class UserResponse(UserBase):
         from_attributes = True
 
 
+class UserImportError(BaseModel):
+    row: int  # Line number in the CSV, header is line 1
+    detail: str
+
+
+class UserImportResponse(BaseModel):
+    created: int
+    errors: List[UserImportError] = []
+
+
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 
 class TokenData(BaseModel):
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from .core.database import SessionLocal, engine
+from .core.database import SessionLocal
 from .core.security import get_password_hash
 from .models.user import User, UserRole
 from .models.project import Project
@@ -9,10 +9,7 @@ from datetime import datetime, timedelta
 
 
 def create_sample_data():
-    # Create all tables
-    from .models import user, project, story, sprint
-    user.Base.metadata.create_all(bind=engine)
-    
+    """Insert demo users, projects and stories; expects `python -m app.migrate` to have run"""
     db = SessionLocal()
     
     try:
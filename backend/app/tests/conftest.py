@@ -0,0 +1,125 @@
+"""API tests, driven through the ASGI app against a real database.
+
+    cd backend && python -m pytest                                              # throwaway SQLite file
+    cd backend && TEST_DATABASE_URL=postgresql://localhost/pm_test python -m pytest
+
+The database is dropped and migrated from scratch at the start of the session,
+so never point TEST_DATABASE_URL at one you want to keep.
+`python -m benchmarks.backend_matrix` runs this suite once per backend.
+"""
+import asyncio
+import itertools
+import os
+import tempfile
+
+# The engines are built from the settings at import, so this has to come first
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("PASSWORD_HASH_EXECUTOR", "thread")
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+from app.core.database import Base, async_engine, engine, read_engines  # noqa: E402
+from app.core.hashing import password_hasher  # noqa: E402
+from app.core.throttle import MemoryThrottleBackend, login_throttle  # noqa: E402
+from app.main import app  # noqa: E402
+from app.migrations import migration_metadata, run_migrations  # noqa: E402
+from app.seed_data import create_sample_data  # noqa: E402
+
+ADMIN = ("admin", "admin123")
+TEAM_LEAD = ("shantnu", "password123")
+
+_unique = itertools.count(1)
+
+
+def unique(prefix: str) -> str:
+    return f"{prefix}{next(_unique)}"
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    # One loop for the whole run: pooled asyncpg connections are tied to their loop
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    Base.metadata.drop_all(bind=engine)
+    migration_metadata.drop_all(bind=engine)
+    run_migrations(engine)
+    create_sample_data()
+    yield engine
+    password_hasher.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def fresh_login_throttle():
+    """Every test starts with an empty attempt log"""
+    login_throttle.backend = MemoryThrottleBackend()
+
+
+@pytest.fixture(scope="session")
+async def client():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    for db_engine in {async_engine, *read_engines}:
+        await db_engine.dispose()
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> dict:
+    """Token pair for `username`; fails the test if the login is refused"""
+    response = await client.post("/api/auth/login", json={"username": username, "password": password})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def bearer(tokens: dict) -> dict:
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+@pytest.fixture
+async def admin_headers(client):
+    return bearer(await login(client, *ADMIN))
+
+
+@pytest.fixture
+async def project(client, admin_headers):
+    """A new, empty project, so tests don't see each other's stories"""
+    prefix = unique("T")
+    response = await client.post(
+        "/api/projects", headers=admin_headers, json={"name": f"Project {prefix}", "prefix": prefix}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.fixture
+async def new_user(client, admin_headers):
+    """Factory for users that a test may change or delete; returns (user, password)"""
+    async def create(role: str = "User"):
+        username = unique("user")
+        password = f"{username}-password"
+        response = await client.post("/api/users", headers=admin_headers, json={
+            "username": username,
+            "email": f"{username}@example.com",
+            "full_name": f"Test {username}",
+            "role": role,
+            "password": password,
+        })
+        assert response.status_code == 200, response.text
+        return response.json(), password
+    return create
+
+
+async def create_sprint(client: httpx.AsyncClient, headers: dict, project_id: int) -> dict:
+    response = await client.post("/api/sprints", headers=headers, json={
+        "name": unique("Sprint "),
+        "project_id": project_id,
+        "start_date": "2024-01-01T00:00:00",
+        "end_date": "2024-01-14T00:00:00",
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
@@ -0,0 +1,50 @@
+from .conftest import login, bearer
+
+
+async def create_key(client, admin_headers, user_id, scopes):
+    response = await client.post(
+        "/api/api-keys", headers=admin_headers, json={"name": "ci", "user_id": user_id, "scopes": scopes}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def test_read_only_key_can_read_but_not_write(client, admin_headers, new_user, project):
+    service, _ = await new_user()
+    key = await create_key(client, admin_headers, service["id"], ["read"])
+    headers = {"X-API-Key": key["key"]}
+
+    assert key["scopes"] == ["read"]
+    assert (await client.get("/api/projects", headers=headers)).status_code == 200
+    assert (await client.get(f"/api/projects/{project['id']}/board", headers=headers)).status_code == 200
+    write = await client.post("/api/stories", headers=headers, json={"title": "Nope", "project_id": project["id"]})
+    assert write.status_code == 403
+
+
+async def test_write_key_acts_as_its_service_account(client, admin_headers, new_user, project):
+    service, _ = await new_user()
+    key = await create_key(client, admin_headers, service["id"], ["read", "write"])
+
+    response = await client.post(
+        "/api/stories", headers={"X-API-Key": key["key"]}, json={"title": "From CI", "project_id": project["id"]}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["created_by"] == service["id"]
+
+
+async def test_revoked_and_unknown_keys_are_rejected(client, admin_headers, new_user):
+    service, _ = await new_user()
+    key = await create_key(client, admin_headers, service["id"], ["read"])
+
+    assert (await client.delete(f"/api/api-keys/{key['id']}", headers=admin_headers)).status_code == 200
+    assert (await client.get("/api/projects", headers={"X-API-Key": key["key"]})).status_code == 401
+    assert (await client.get("/api/projects", headers={"X-API-Key": "pm_unknown"})).status_code == 401
+
+
+async def test_only_admins_manage_keys(client, new_user):
+    user, password = await new_user("Team Lead")
+    headers = bearer(await login(client, user["username"], password))
+
+    response = await client.post("/api/api-keys", headers=headers, json={"name": "x", "user_id": user["id"]})
+    assert response.status_code == 403
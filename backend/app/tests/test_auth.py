@@ -0,0 +1,86 @@
+from app.core.config import settings
+from .conftest import login, bearer
+
+
+async def test_refresh_rotates_the_token_pair(client, new_user):
+    user, password = await new_user()
+    tokens = await login(client, user["username"], password)
+
+    response = await client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert (await client.get("/api/users/me", headers=bearer(rotated))).status_code == 200
+
+
+async def test_reused_refresh_token_revokes_the_family(client, new_user):
+    user, password = await new_user()
+    tokens = await login(client, user["username"], password)
+    rotated = (await client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})).json()
+
+    reused = await client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert reused.status_code == 401
+    # The legitimate successor is dead too: the session has to log in again
+    successor = await client.post("/api/auth/refresh", json={"refresh_token": rotated["refresh_token"]})
+    assert successor.status_code == 401
+
+
+async def test_logout_revokes_the_refresh_token(client, new_user):
+    user, password = await new_user()
+    tokens = await login(client, user["username"], password)
+
+    assert (await client.post("/api/auth/logout", json={"refresh_token": tokens["refresh_token"]})).status_code == 200
+    response = await client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+
+
+async def test_role_change_revokes_issued_tokens(client, admin_headers, new_user):
+    user, password = await new_user()
+    tokens = await login(client, user["username"], password)
+    assert (await client.get("/api/users/me", headers=bearer(tokens))).status_code == 200
+
+    response = await client.put(f"/api/users/{user['id']}", headers=admin_headers, json={"role": "Team Lead"})
+    assert response.status_code == 200
+
+    assert (await client.get("/api/users/me", headers=bearer(tokens))).status_code == 401
+    assert (await client.get("/api/projects", headers=bearer(tokens))).status_code == 401
+    refreshed = await client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert refreshed.status_code == 401
+
+    fresh = await login(client, user["username"], password)
+    me = await client.get("/api/users/me", headers=bearer(fresh))
+    assert me.json()["role"] == "Team Lead"
+
+
+async def test_login_is_throttled_per_username(client, new_user):
+    user, password = await new_user()
+    attempts = [
+        await client.post("/api/auth/login", json={"username": user["username"], "password": "wrong"})
+        for _ in range(settings.login_attempts_per_username)
+    ]
+    assert {response.status_code for response in attempts} == {401}
+
+    blocked = await client.post("/api/auth/login", json={"username": user["username"], "password": password})
+    assert blocked.status_code == 429
+    assert int(blocked.headers["Retry-After"]) > 0
+
+
+async def test_successful_login_clears_username_failures(client, new_user):
+    user, password = await new_user()
+    for _ in range(settings.login_attempts_per_username - 1):
+        await client.post("/api/auth/login", json={"username": user["username"], "password": "wrong"})
+    await login(client, user["username"], password)
+
+    for _ in range(settings.login_attempts_per_username - 1):
+        response = await client.post("/api/auth/login", json={"username": user["username"], "password": "wrong"})
+        assert response.status_code == 401
+
+
+async def test_metrics_are_admin_only(client, admin_headers, new_user):
+    user, password = await new_user()
+    assert (await client.get("/metrics")).status_code == 403
+    assert (await client.get("/metrics", headers=bearer(await login(client, user["username"], password)))).status_code == 403
+    response = await client.get("/metrics", headers=admin_headers)
+    assert response.status_code == 200
+    assert {"principal_cache", "token_cache", "password_hasher"} <= response.json().keys()
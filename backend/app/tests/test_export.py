@@ -0,0 +1,64 @@
+import csv
+import io
+import json
+from datetime import datetime
+import pytest
+from app.api.stories import EXPORT_COLUMNS
+
+
+async def export(client, headers, **params):
+    response = await client.get("/api/stories/export", headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    return response
+
+
+@pytest.fixture
+async def exported_project(client, admin_headers, project):
+    items = [
+        {"title": "First", "project_id": project["id"], "status": "In Progress", "priority": "High",
+         "due_date": "2030-05-01T12:00:00"},
+        {"title": "Second, with a comma", "project_id": project["id"], "description": "Line one\nline two"},
+        {"title": "Third", "project_id": project["id"], "status": "In Progress"},
+    ]
+    response = await client.post("/api/stories/bulk", headers=admin_headers, json={"stories": items})
+    assert response.status_code == 200, response.text
+    return project
+
+
+async def test_ndjson_export(client, admin_headers, exported_project):
+    response = await export(client, admin_headers, project_id=exported_project["id"])
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == ["First", "Second, with a comma", "Third"]
+    assert all(list(row) == EXPORT_COLUMNS for row in rows)
+    first = rows[0]
+    assert (first["status"], first["priority"], first["story_type"]) == ("In Progress", "High", "Story")
+    assert datetime.fromisoformat(first["due_date"]).replace(tzinfo=None) == datetime(2030, 5, 1, 12)
+    datetime.fromisoformat(first["created_at"])
+    assert rows[1]["description"] == "Line one\nline two"
+    assert rows[1]["due_date"] is None
+
+
+async def test_csv_export(client, admin_headers, exported_project):
+    response = await export(client, admin_headers, project_id=exported_project["id"], format="csv")
+
+    assert response.headers["content-type"].startswith("text/csv")
+    header, *rows = list(csv.reader(io.StringIO(response.text)))
+    assert header == EXPORT_COLUMNS
+    rows = [dict(zip(header, row)) for row in rows]
+    assert [row["title"] for row in rows] == ["First", "Second, with a comma", "Third"]
+    assert (rows[0]["status"], rows[0]["priority"]) == ("In Progress", "High")
+    assert datetime.fromisoformat(rows[0]["due_date"]).replace(tzinfo=None) == datetime(2030, 5, 1, 12)
+    assert rows[1]["description"] == "Line one\nline two"
+    assert rows[1]["due_date"] == ""
+
+
+@pytest.mark.parametrize("format", ["ndjson", "csv"])
+async def test_export_filters(client, admin_headers, exported_project, format):
+    response = await export(client, admin_headers, project_id=exported_project["id"], status="In Progress", format=format)
+    lines = response.text.splitlines()
+    assert len(lines) == (2 if format == "ndjson" else 3)
+
+    response = await client.get("/api/stories/export", headers=admin_headers, params={"status": "Done", "format": format})
+    assert response.status_code == 422
@@ -0,0 +1,86 @@
+from .conftest import create_sprint, unique
+
+
+async def test_unknown_team_lead_is_rejected(client, admin_headers, project):
+    prefix = unique("T")
+    response = await client.post("/api/projects", headers=admin_headers, json={
+        "name": f"Project {prefix}", "prefix": prefix, "team_lead_id": 999999,
+    })
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Team lead not found"
+
+    response = await client.put(f"/api/projects/{project['id']}", headers=admin_headers, json={"team_lead_id": 999999})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Team lead not found"
+
+
+async def create_board_stories(client, headers, project_id):
+    """Eight stories: five in Backlog (one with a sprint), three In Progress"""
+    items = [
+        {"title": f"Backlog {index}", "project_id": project_id, "story_points": index + 1,
+         "priority": ("Low", "High", "Medium")[index % 3]}
+        for index in range(5)
+    ] + [
+        {"title": f"Doing {index}", "project_id": project_id, "story_points": 8, "status": "In Progress"}
+        for index in range(3)
+    ]
+    response = await client.post("/api/stories/bulk", headers=headers, json={"stories": items})
+    assert response.status_code == 200, response.text
+    return response.json()["created"]
+
+
+def board_columns(response):
+    assert response.status_code == 200, response.text
+    return {column["status"]: column for column in response.json()["columns"]}
+
+
+async def test_board_counts_and_points_per_column(client, admin_headers, project):
+    await create_board_stories(client, admin_headers, project["id"])
+
+    columns = board_columns(await client.get(f"/api/projects/{project['id']}/board", headers=admin_headers))
+
+    assert {status: (column["count"], column["story_points"]) for status, column in columns.items()} == {
+        "Backlog": (5, 15), "To Do": (0, 0), "In Progress": (3, 24),
+        "Blocked": (0, 0), "Validation": (0, 0), "Completed": (0, 0),
+    }
+    backlog = [story["title"] for story in columns["Backlog"]["stories"]]
+    assert backlog == ["Backlog 1", "Backlog 4", "Backlog 2", "Backlog 0", "Backlog 3"]
+    assert columns["Backlog"]["next_cursor"] is None
+
+
+async def test_board_column_limits_continue_through_the_story_list(client, admin_headers, project):
+    await create_board_stories(client, admin_headers, project["id"])
+
+    columns = board_columns(await client.get(
+        f"/api/projects/{project['id']}/board", headers=admin_headers,
+        params={"limit": 2, "limits": "In Progress:0"},
+    ))
+
+    assert [story["title"] for story in columns["Backlog"]["stories"]] == ["Backlog 1", "Backlog 4"]
+    assert columns["In Progress"]["stories"] == [] and columns["In Progress"]["count"] == 3
+    rest = await client.get("/api/stories", headers=admin_headers, params={
+        "project_id": project["id"], "status": "Backlog", "sort": "priority",
+        "cursor": columns["Backlog"]["next_cursor"],
+    })
+    assert rest.status_code == 200, rest.text
+    assert [story["title"] for story in rest.json()] == ["Backlog 2", "Backlog 0", "Backlog 3"]
+
+    response = await client.get(f"/api/projects/{project['id']}/board", headers=admin_headers, params={"limits": "Done:1"})
+    assert response.status_code == 400
+
+
+async def test_board_sprint_filter(client, admin_headers, project):
+    created = await create_board_stories(client, admin_headers, project["id"])
+    sprint = await create_sprint(client, admin_headers, project["id"])
+    await client.patch(f"/api/stories/{created[0]['id']}", headers=admin_headers, json={"sprint_id": sprint["id"]})
+
+    columns = board_columns(await client.get(
+        f"/api/projects/{project['id']}/board", headers=admin_headers, params={"sprint_id": sprint["id"]}
+    ))
+    assert [story["title"] for column in columns.values() for story in column["stories"]] == ["Backlog 0"]
+
+    # Sprint 0 is a filter that matches nothing, not a missing one
+    columns = board_columns(await client.get(
+        f"/api/projects/{project['id']}/board", headers=admin_headers, params={"sprint_id": 0}
+    ))
+    assert all(column["count"] == 0 and column["stories"] == [] for column in columns.values())
@@ -0,0 +1,80 @@
+import os
+import pytest
+from .conftest import unique
+
+SQLITE = os.environ["DATABASE_URL"].startswith("sqlite")
+sqlite_only = pytest.mark.skipif(not SQLITE, reason="story search uses the SQLite FTS5 index")
+
+
+async def search(client, headers, q, **params):
+    response = await client.get("/api/stories/search", headers=headers, params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return [story["title"] for story in response.json()]
+
+
+async def create_story(client, headers, project_id, title, **fields):
+    response = await client.post("/api/stories", headers=headers, json={"title": title, "project_id": project_id, **fields})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@sqlite_only
+async def test_title_matches_rank_above_body_matches(client, admin_headers, project):
+    word = unique("kumquat")
+    await create_story(client, admin_headers, project["id"], "Mentions it below", description=f"About the {word} feed")
+    await create_story(client, admin_headers, project["id"], f"{word} feed")
+    await create_story(client, admin_headers, project["id"], "Unrelated")
+
+    assert await search(client, admin_headers, word) == [f"{word} feed", "Mentions it below"]
+    # Every word has to match, each as a prefix
+    assert await search(client, admin_headers, f"{word[:-1]} fe") == [f"{word} feed", "Mentions it below"]
+    assert await search(client, admin_headers, f"{word} missing") == []
+
+
+@sqlite_only
+async def test_project_and_status_filters(client, admin_headers, project):
+    word = unique("quince")
+    await create_story(client, admin_headers, project["id"], f"{word} backlog")
+    await create_story(client, admin_headers, project["id"], f"{word} doing", status="In Progress")
+    await create_story(client, admin_headers, 1, f"{word} elsewhere")
+
+    assert sorted(await search(client, admin_headers, word)) == [f"{word} backlog", f"{word} doing", f"{word} elsewhere"]
+    assert sorted(await search(client, admin_headers, word, project_id=project["id"])) == [f"{word} backlog", f"{word} doing"]
+    assert await search(client, admin_headers, word, project_id=project["id"], status="In Progress") == [f"{word} doing"]
+
+
+@sqlite_only
+async def test_story_numbers_match_as_one_term(client, admin_headers):
+    prefix = f"{unique('Q')}&D"
+    response = await client.post("/api/projects", headers=admin_headers, json={"name": prefix, "prefix": prefix})
+    project_id = response.json()["id"]
+    stories = [await create_story(client, admin_headers, project_id, f"Story {index}") for index in range(11)]
+    # Every token of the number, but not the number itself
+    await create_story(client, admin_headers, project_id, f"{prefix} 1001 notes")
+
+    response = await client.get("/api/stories/search", headers=admin_headers, params={"q": f"{prefix}-1001"})
+    assert [story["story_number"] for story in response.json()] == [f"{prefix}-1001"]
+    assert await search(client, admin_headers, f"{prefix.lower()}-100") == [f"Story {index}" for index in range(9)]
+    assert await search(client, admin_headers, f"{prefix}-1010") == ["Story 9"]
+    assert stories[9]["story_number"] == f"{prefix}-1010"
+
+
+@sqlite_only
+async def test_index_follows_updates_and_deletes(client, admin_headers, project):
+    old, new = unique("medlar"), unique("loquat")
+    story = await create_story(client, admin_headers, project["id"], f"{old} story")
+
+    response = await client.patch(f"/api/stories/{story['id']}", headers=admin_headers, json={"title": f"{new} story"})
+    assert response.status_code == 200
+    assert await search(client, admin_headers, old) == []
+    assert await search(client, admin_headers, new) == [f"{new} story"]
+
+    response = await client.delete(f"/api/stories/{story['id']}", headers=admin_headers)
+    assert response.status_code == 200
+    assert await search(client, admin_headers, new) == []
+
+
+@pytest.mark.skipif(SQLITE, reason="SQLite has the search index")
+async def test_search_is_not_implemented_without_sqlite(client, admin_headers):
+    response = await client.get("/api/stories/search", headers=admin_headers, params={"q": "story"})
+    assert response.status_code == 501
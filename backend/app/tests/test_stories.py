@@ -0,0 +1,345 @@
+import asyncio
+import os
+import pytest
+from sqlalchemy import select, update
+from app.api.stories import STORY_SORT_KEYS, filter_stories
+from app.core.pagination import keyset_after
+from app.core.config import settings
+from app.models.story import Story
+from .conftest import create_sprint, login, bearer, TEAM_LEAD
+
+sqlite_only = pytest.mark.skipif(
+    not os.environ["DATABASE_URL"].startswith("sqlite"), reason="inspects SQLite query plans"
+)
+
+PRIORITY_RANKS = {"High": 0, "Medium": 1, "Low": 2}
+
+SORT_VALUES = {
+    "created_at": lambda story: (story["id"],),
+    "priority": lambda story: (PRIORITY_RANKS[story["priority"]], story["id"]),
+    "story_points": lambda story: (story["story_points"] or 0, story["id"]),
+}
+
+
+async def create_stories(client, headers, project_id, count, **fields):
+    items = [
+        {
+            "title": f"Story {index}",
+            "project_id": project_id,
+            "priority": ("High", "Medium", "Low")[index % 3],
+            "story_points": (1, 3, 5, 8)[index % 4],
+            **fields,
+        }
+        for index in range(count)
+    ]
+    response = await client.post("/api/stories/bulk", headers=headers, json={"stories": items})
+    assert response.status_code == 200, response.text
+    return response.json()["created"]
+
+
+async def walk_pages(client, headers, **params):
+    """Every story of a listing, following X-Next-Cursor page by page"""
+    stories, cursor = [], None
+    while True:
+        response = await client.get(
+            "/api/stories", headers=headers, params={**params, **({"cursor": cursor} if cursor else {})}
+        )
+        assert response.status_code == 200, response.text
+        stories.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return stories
+
+
+async def test_concurrent_creates_get_distinct_numbers(client, admin_headers, project):
+    responses = await asyncio.gather(*(
+        client.post("/api/stories", headers=admin_headers, json={"title": f"Story {index}", "project_id": project["id"]})
+        for index in range(40)
+    ))
+
+    assert [response.status_code for response in responses] == [200] * 40
+    numbers = sorted(response.json()["story_number"] for response in responses)
+    assert numbers == [f"{project['prefix']}-{number:04d}" for number in range(1001, 1041)]
+
+
+async def test_bulk_create_continues_the_sequence(client, admin_headers, project):
+    single = await client.post("/api/stories", headers=admin_headers, json={"title": "First", "project_id": project["id"]})
+    created = await create_stories(client, admin_headers, project["id"], 3)
+
+    assert single.json()["story_number"] == f"{project['prefix']}-1001"
+    assert [story["story_number"] for story in created] == [f"{project['prefix']}-{n}" for n in (1002, 1003, 1004)]
+
+
+@pytest.mark.parametrize("sort", sorted(SORT_VALUES))
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_keyset_pages_cover_every_story_once(client, admin_headers, project, sort, order):
+    created = await create_stories(client, admin_headers, project["id"], 23)
+
+    stories = await walk_pages(
+        client, admin_headers, project_id=project["id"], sort=sort, order=order, limit=5
+    )
+
+    expected = sorted(created, key=SORT_VALUES[sort], reverse=order == "desc")
+    assert [story["id"] for story in stories] == [story["id"] for story in expected]
+
+
+async def test_cursor_must_match_the_sort(client, admin_headers, project):
+    await create_stories(client, admin_headers, project["id"], 3)
+    first = await client.get(
+        "/api/stories", headers=admin_headers, params={"project_id": project["id"], "limit": 1}
+    )
+    cursor = first.headers["X-Next-Cursor"]
+
+    response = await client.get(
+        "/api/stories", headers=admin_headers,
+        params={"project_id": project["id"], "limit": 1, "sort": "priority", "cursor": cursor}
+    )
+    assert response.status_code == 400
+    garbage = await client.get("/api/stories", headers=admin_headers, params={"cursor": "not-a-cursor"})
+    assert garbage.status_code == 400
+
+
+async def test_bulk_create_atomic_rejects_the_batch(client, admin_headers, project):
+    items = [
+        {"title": "Fine", "project_id": project["id"]},
+        {"title": "Bad assignee", "project_id": project["id"], "assignee_id": 999999},
+    ]
+    response = await client.post("/api/stories/bulk", headers=admin_headers, json={"stories": items})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == [{"index": 1, "detail": "Assignee not found"}]
+    assert await walk_pages(client, admin_headers, project_id=project["id"]) == []
+
+
+async def test_bulk_create_partial_skips_invalid_items(client, admin_headers, project):
+    items = [
+        {"title": "Fine", "project_id": project["id"]},
+        {"title": "Bad project", "project_id": 999999},
+        {"title": "Also fine", "project_id": project["id"]},
+    ]
+    response = await client.post(
+        "/api/stories/bulk", headers=admin_headers, json={"stories": items, "mode": "partial"}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [story["title"] for story in body["created"]] == ["Fine", "Also fine"]
+    assert body["errors"] == [{"index": 1, "detail": "Project not found"}]
+
+
+@pytest.mark.parametrize("field, detail", [
+    ("assignee_id", "Assignee not found"),
+    ("sprint_id", "Sprint not found in this project"),
+])
+async def test_bulk_create_partial_reports_zero_references(client, admin_headers, project, field, detail):
+    items = [
+        {"title": "Fine", "project_id": project["id"]},
+        {"title": "Zero", "project_id": project["id"], field: 0},
+    ]
+    response = await client.post(
+        "/api/stories/bulk", headers=admin_headers, json={"stories": items, "mode": "partial"}
+    )
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [story["title"] for story in body["created"]] == ["Fine"]
+    assert body["errors"] == [{"index": 1, "detail": detail}]
+
+
+async def test_bulk_patch_by_ids(client, admin_headers, project):
+    created = await create_stories(client, admin_headers, project["id"], 4)
+    ids = [story["id"] for story in created[:2]]
+
+    response = await client.patch(
+        "/api/stories/bulk", headers=admin_headers, json={"ids": ids, "changes": {"status": "In Progress"}}
+    )
+
+    assert response.status_code == 200
+    assert sorted(story["id"] for story in response.json()["updated"]) == ids
+    statuses = {story["id"]: story["status"] for story in await walk_pages(client, admin_headers, project_id=project["id"])}
+    assert [statuses[story["id"]] for story in created] == ["In Progress", "In Progress", "Backlog", "Backlog"]
+
+
+async def test_bulk_patch_by_filter_stays_in_scope(client, admin_headers, project):
+    created = await create_stories(client, admin_headers, project["id"], 3)
+    other = await client.get("/api/stories", headers=admin_headers, params={"limit": 1})
+    untouched = other.json()[0]
+
+    response = await client.patch(
+        "/api/stories/bulk", headers=admin_headers,
+        json={"filter": {"project_id": project["id"]}, "changes": {"story_points": 13}}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["count"] == len(created)
+    after = (await client.get(f"/api/stories/{untouched['id']}", headers=admin_headers)).json()
+    assert after["story_points"] == untouched["story_points"]
+
+
+@pytest.mark.parametrize("body", [
+    {"changes": {"status": "In Progress"}},
+    {"ids": [1], "filter": {"project_id": 1}, "changes": {"status": "In Progress"}},
+    {"filter": {}, "changes": {"status": "In Progress"}},
+    {"ids": [1], "changes": {}},
+])
+async def test_bulk_patch_refuses_unscoped_requests(client, admin_headers, body):
+    response = await client.patch("/api/stories/bulk", headers=admin_headers, json=body)
+    assert response.status_code == 400
+
+
+async def test_team_lead_can_create_stories(client, project):
+    headers = bearer(await login(client, *TEAM_LEAD))
+    response = await client.post("/api/stories", headers=headers, json={"title": "Lead", "project_id": project["id"]})
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("criterion", ["project_id", "assignee_id", "sprint_id"])
+async def test_bulk_patch_zero_id_filter_updates_nothing(client, admin_headers, project, criterion):
+    created = await create_stories(client, admin_headers, project["id"], 2)
+
+    response = await client.patch(
+        "/api/stories/bulk", headers=admin_headers,
+        json={"filter": {criterion: 0}, "changes": {"story_points": 21}}
+    )
+
+    assert response.status_code == 422
+    stories = await walk_pages(client, admin_headers, project_id=project["id"])
+    assert [story["story_points"] for story in stories] == [story["story_points"] for story in created]
+
+
+def test_filter_stories_keeps_zero_ids():
+    assert filter_stories(update(Story), project_id=0).whereclause is not None
+
+
+async def test_zero_project_filter_lists_nothing(client, admin_headers):
+    response = await client.get("/api/stories", headers=admin_headers, params={"project_id": 0})
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+async def test_bulk_create_partial_reports_malformed_items(client, admin_headers, project):
+    items = [
+        {"title": "Fine", "project_id": project["id"]},
+        {"project_id": project["id"]},
+        {"title": "Bad points", "project_id": project["id"], "story_points": "lots"},
+        {"title": "Also fine", "project_id": project["id"]},
+    ]
+    response = await client.post(
+        "/api/stories/bulk", headers=admin_headers, json={"stories": items, "mode": "partial"}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [story["title"] for story in body["created"]] == ["Fine", "Also fine"]
+    assert [(error["index"], error["detail"].split(":")[0]) for error in body["errors"]] == [
+        (1, "title"), (2, "story_points")
+    ]
+
+
+async def test_bulk_create_atomic_rejects_malformed_items(client, admin_headers, project):
+    items = [{"title": "Fine", "project_id": project["id"]}, {"title": "No project"}]
+    response = await client.post("/api/stories/bulk", headers=admin_headers, json={"stories": items})
+
+    assert response.status_code == 400
+    assert [error["index"] for error in response.json()["detail"]] == [1]
+    assert await walk_pages(client, admin_headers, project_id=project["id"]) == []
+
+
+async def test_bulk_create_caps_the_batch_size(client, admin_headers, project):
+    items = [{"title": "x", "project_id": project["id"]}] * (settings.max_bulk_items + 1)
+    response = await client.post("/api/stories/bulk", headers=admin_headers, json={"stories": items})
+    assert response.status_code == 422
+
+
+@sqlite_only
+@pytest.mark.parametrize("sort", sorted(STORY_SORT_KEYS))
+@pytest.mark.parametrize("filters", [
+    {},
+    {"status": "IN_PROGRESS"},
+    {"project_id": 1},
+    {"project_id": 1, "status": "IN_PROGRESS"},
+    {"assignee_id": 2},
+    {"assignee_id": 2, "status": "IN_PROGRESS"},
+    {"sprint_id": 1},
+    {"sprint_id": 1, "status": "IN_PROGRESS"},
+])
+def test_keyset_pages_walk_an_index(database, sort, filters):
+    keys = STORY_SORT_KEYS[sort]
+    statement = filter_stories(select(Story), **filters)
+    statement = statement.where(keyset_after(keys, [1] * len(keys))).order_by(*keys).limit(50)
+    compiled = statement.compile(database)
+
+    with database.connect() as connection:
+        plan = [row[-1] for row in connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {compiled}", tuple(compiled.params[name] for name in compiled.positiontup)
+        )]
+
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+    assert plan[0].startswith("SEARCH stories USING"), plan
+
+
+@pytest.mark.parametrize("field, detail", [
+    ("assignee_id", "Assignee not found"),
+    ("sprint_id", "Sprint not found in this project"),
+])
+async def test_create_rejects_unknown_references(client, admin_headers, project, field, detail):
+    response = await client.post("/api/stories", headers=admin_headers, json={
+        "title": "Dangling", "project_id": project["id"], field: 999999,
+    })
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
+
+
+async def test_bulk_patch_checks_the_new_references(client, admin_headers, project):
+    created = await create_stories(client, admin_headers, project["id"], 2)
+    ids = [story["id"] for story in created]
+    foreign_sprint = await create_sprint(client, admin_headers, 1)
+
+    for changes, detail in [
+        ({"assignee_id": 999999}, "Assignee not found"),
+        ({"sprint_id": 999999}, "Sprint not found in the project of every story"),
+        ({"sprint_id": foreign_sprint["id"]}, "Sprint not found in the project of every story"),
+    ]:
+        response = await client.patch("/api/stories/bulk", headers=admin_headers, json={"ids": ids, "changes": changes})
+        assert response.status_code == 400, changes
+        assert response.json()["detail"] == detail
+
+    sprint = await create_sprint(client, admin_headers, project["id"])
+    response = await client.patch(
+        "/api/stories/bulk", headers=admin_headers,
+        json={"filter": {"project_id": project["id"]}, "changes": {"sprint_id": sprint["id"], "assignee_id": 1}}
+    )
+    assert response.status_code == 200
+    assert response.json()["count"] == 2
+
+
+async def test_patch_writes_only_the_sent_columns(client, admin_headers, project):
+    response = await client.post("/api/stories", headers=admin_headers, json={
+        "title": "Original", "description": "Keep me", "project_id": project["id"], "story_points": 5, "assignee_id": 1,
+    })
+    story = response.json()
+    assert story["updated_at"] is None
+
+    response = await client.patch(f"/api/stories/{story['id']}", headers=admin_headers, json={"status": "In Progress"})
+
+    assert response.status_code == 200
+    patched = response.json()
+    assert patched["updated_at"] is not None
+    assert patched == {**story, "status": "In Progress", "updated_at": patched["updated_at"]}
+    assert (await client.get(f"/api/stories/{story['id']}", headers=admin_headers)).json() == patched
+
+
+@pytest.mark.parametrize("method", ["put", "patch"])
+async def test_update_rejects_bad_values(client, admin_headers, project, method):
+    story = (await client.post("/api/stories", headers=admin_headers, json={"title": "Target", "project_id": project["id"]})).json()
+    foreign_sprint = await create_sprint(client, admin_headers, 1)
+    update = getattr(client, method)
+
+    for body in ({"title": None}, {"status": None}, {"story_points": None}):
+        assert (await update(f"/api/stories/{story['id']}", headers=admin_headers, json=body)).status_code == 422
+    for body in ({"assignee_id": 999999}, {"sprint_id": 999999}, {"sprint_id": foreign_sprint["id"]}):
+        assert (await update(f"/api/stories/{story['id']}", headers=admin_headers, json=body)).status_code == 400
+
+    response = await update(f"/api/stories/{story['id']}", headers=admin_headers, json={"assignee_id": None, "due_date": None})
+    assert response.status_code == 200
+    assert (await client.get(f"/api/stories/{story['id']}", headers=admin_headers)).json()["title"] == "Target"
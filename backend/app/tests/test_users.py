@@ -0,0 +1,166 @@
+import sys
+from sqlalchemy import func, select
+from app import user_import
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.models.user import User
+from app.user_import import import_users
+from .conftest import login, bearer, unique
+
+
+async def test_integrity_errors_are_client_errors(client, admin_headers, new_user, project):
+    user, password = await new_user()
+    headers = bearer(await login(client, user["username"], password))
+    response = await client.post("/api/stories", headers=headers, json={"title": "Mine", "project_id": project["id"]})
+    assert response.status_code == 200, response.text
+
+    # The story still points at its creator, so the foreign key refuses the delete
+    response = await client.delete(f"/api/users/{user['id']}", headers=admin_headers)
+    assert response.status_code == 400
+
+
+def import_csv(rows, header="username,email,full_name,password,role"):
+    return "\n".join([header, *rows]) + "\n"
+
+
+async def test_csv_import_reports_bad_rows(client, admin_headers):
+    name = unique("imported")
+    content = import_csv([
+        f"{name}a,{name}a@example.com,Imported A,secret-a,Team Lead",
+        f"{name}b,{name}b@example.com,Imported B,secret-b,",
+        f"{name}a,{name}c@example.com,Same username,secret-c,",     # duplicate in file
+        f"{name}d,{name}b@example.com,Same email,secret-d,",        # duplicate in file
+        f"admin,{name}e@example.com,Existing username,secret-e,",
+        f"{name}f,admin@projectmanagement.com,Existing email,secret-f,",
+        f"{name}g,not-an-email,Bad email,secret-g,",
+        f"{name}h,{name}h@example.com,Bad role,secret-h,Owner",
+    ])
+
+    response = await client.post(
+        "/api/users/import", headers=admin_headers, files={"file": ("users.csv", content, "text/csv")}
+    )
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["created"] == 2
+    assert [(error["row"], error["detail"]) for error in body["errors"][:4]] == [
+        (4, "Duplicate username in file"),
+        (5, "Duplicate email in file"),
+        (6, "Username already exists"),
+        (7, "Email already exists"),
+    ]
+    assert [error["row"] for error in body["errors"][4:]] == [8, 9]
+
+    users = (await client.get("/api/users", headers=admin_headers, params={"q": name})).json()
+    assert [(user["username"], user["role"]) for user in users] == [(f"{name}a", "Team Lead"), (f"{name}b", "User")]
+    await login(client, f"{name}a", "secret-a")
+
+
+async def test_csv_import_needs_the_required_columns(client, admin_headers):
+    content = import_csv(["someone,someone@example.com,Someone"], header="username,email,full_name")
+    response = await client.post(
+        "/api/users/import", headers=admin_headers, files={"file": ("users.csv", content, "text/csv")}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Missing CSV columns: password"
+
+
+def test_import_users_across_chunks(database):
+    name = unique("chunked")
+    rows = [f"{name}{index},{name}{index}@example.com,Chunked {index},secret-{index}," for index in range(7)]
+    # Duplicates of rows in earlier chunks, and one invalid row in the middle
+    rows[3] = f"{name}0,{name}x@example.com,Repeat,secret,"
+    rows.append(f"{name}x,{name}1@example.com,Repeat email,secret,")
+    rows.insert(5, f"{name}y,,No email,secret,")
+
+    db = SessionLocal()
+    try:
+        result = import_users(db, import_csv(rows).splitlines(keepends=True), chunk_size=2)
+        created = db.scalar(select(func.count(User.id)).where(User.username.like(f"{name}%")))
+    finally:
+        db.close()
+
+    assert result["created"] == 6 == created
+    assert [(error["row"], error["detail"]) for error in result["errors"] if "Duplicate" in error["detail"]] == [
+        (5, "Duplicate username in file"),
+        (10, "Duplicate email in file"),
+    ]
+    assert [error["row"] for error in result["errors"]] == [5, 7, 10]
+
+
+def test_import_cli(database, tmp_path, monkeypatch, capsys):
+    name = unique("cli")
+    csv_file = tmp_path / "users.csv"
+    csv_file.write_text(import_csv([
+        f"{name},{name}@example.com,From the CLI,secret,",
+        f"{name},{name}2@example.com,Again,secret,",
+    ]), encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", ["user_import", str(csv_file), "--chunk-size", "1"])
+
+    user_import.main()
+
+    output = capsys.readouterr().out
+    assert "line 3: Duplicate username in file" in output
+    assert "Created 1 users, skipped 1 rows" in output
+
+
+async def create_directory_user(client, headers, username, full_name, email):
+    response = await client.post("/api/users", headers=headers, json={
+        "username": username, "email": email, "full_name": full_name, "password": "secret",
+    })
+    assert response.status_code == 200, response.text
+
+
+async def typeahead(client, headers, q, **params):
+    response = await client.get("/api/users", headers=headers, params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return [user["username"] for user in response.json()]
+
+
+async def test_typeahead_ranks_exact_then_username_then_name_then_email(client, admin_headers):
+    name = unique("zorbo")
+    await create_directory_user(client, admin_headers, f"mail{name}", "Someone Else", f"{name}@example.com")
+    await create_directory_user(client, admin_headers, f"full{name}", f"{name.title()} Person", f"full{name}@example.com")
+    await create_directory_user(client, admin_headers, f"{name}_b", "B", f"b{name}@example.com")
+    await create_directory_user(client, admin_headers, f"{name}_a", "A", f"a{name}@example.com")
+    await create_directory_user(client, admin_headers, name, "Exact", f"exact{name}@example.com")
+
+    expected = [name, f"{name}_a", f"{name}_b", f"full{name}", f"mail{name}"]
+    assert await typeahead(client, admin_headers, name) == expected
+    assert await typeahead(client, admin_headers, f"  {name.upper()} ") == expected
+    assert await typeahead(client, admin_headers, f"{name}_") == [f"{name}_a", f"{name}_b"]
+    # Prefixes only: the middle of a name is no match
+    assert await typeahead(client, admin_headers, name[1:]) == []
+
+
+async def test_typeahead_is_capped(client, admin_headers, monkeypatch):
+    name = unique("capped")
+    for index in range(3):
+        await create_directory_user(client, admin_headers, f"{name}_{index}", "Capped", f"{name}_{index}@example.com")
+
+    assert await typeahead(client, admin_headers, name, limit=2) == [f"{name}_0", f"{name}_1"]
+    monkeypatch.setattr(settings, "user_typeahead_limit", 2)
+    assert await typeahead(client, admin_headers, name, limit=50) == [f"{name}_0", f"{name}_1"]
+
+
+async def test_directory_pages_by_cursor(client, admin_headers):
+    everyone = (await client.get("/api/users", headers=admin_headers, params={"limit": settings.max_page_size})).json()
+    assert len(everyone) < settings.max_page_size
+
+    seen = []
+    params = {"limit": 3}
+    while True:
+        response = await client.get("/api/users", headers=admin_headers, params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 3
+        seen.extend(user["id"] for user in page)
+        if NEXT_CURSOR_HEADER not in response.headers:
+            break
+        params["cursor"] = response.headers[NEXT_CURSOR_HEADER]
+
+    assert seen == sorted(seen) == [user["id"] for user in everyone]
+
+    response = await client.get("/api/users", headers=admin_headers, params={"cursor": "garbage"})
+    assert response.status_code == 400
@@ -0,0 +1,154 @@
+"""Create users in bulk from a CSV file.
+
+Columns: username, email, full_name, password and optionally role
+("Admin", "Team Lead" or "User"). Rows are processed in chunks: one IN query
+per chunk for existing usernames and emails, passwords hashed across the
+password pool, then one executemany INSERT. Invalid rows are reported by CSV
+line number and skipped.
+
+    cd backend && python -m app.user_import users.csv
+"""
+import argparse
+import csv
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from .core.hashing import password_hasher
+from .models.user import User
+from .schemas import validation_error_detail
+from .schemas.user import UserCreate
+
+REQUIRED_COLUMNS = ("username", "email", "full_name", "password")
+CHUNK_SIZE = 500
+
+
+def read_rows(lines: Iterable[str]) -> Iterator[Tuple[int, dict]]:
+    """(line number, row) pairs; raises ValueError if a required column is missing"""
+    reader = csv.DictReader(lines)
+    missing = [name for name in REQUIRED_COLUMNS if name not in (reader.fieldnames or ())]
+    if missing:
+        raise ValueError(f"Missing CSV columns: {', '.join(missing)}")
+    for row in reader:
+        # Empty cells fall back to the schema defaults (e.g. role)
+        yield reader.line_num, {key: value for key, value in row.items() if key and value not in (None, "")}
+
+
+def _import_chunk(db: Session, chunk: List[Tuple[int, dict]], seen_usernames: set, seen_emails: set) -> Tuple[int, list]:
+    errors = []
+    candidates = []
+    for line, row in chunk:
+        try:
+            user = UserCreate(**row)
+        except ValidationError as error:
+            errors.append({"row": line, "detail": validation_error_detail(error)})
+            continue
+        if user.username in seen_usernames:
+            errors.append({"row": line, "detail": "Duplicate username in file"})
+        elif user.email in seen_emails:
+            errors.append({"row": line, "detail": "Duplicate email in file"})
+        else:
+            seen_usernames.add(user.username)
+            seen_emails.add(user.email)
+            candidates.append((line, user))
+
+    if candidates:
+        taken_usernames = {username for (username,) in db.query(User.username).filter(
+            User.username.in_([user.username for _, user in candidates])
+        )}
+        taken_emails = {email for (email,) in db.query(User.email).filter(
+            User.email.in_([user.email for _, user in candidates])
+        )}
+        # Don't hold a transaction open while the passwords are hashed
+        db.commit()
+
+        valid = []
+        for line, user in candidates:
+            if user.username in taken_usernames:
+                errors.append({"row": line, "detail": "Username already exists"})
+            elif user.email in taken_emails:
+                errors.append({"row": line, "detail": "Email already exists"})
+            else:
+                valid.append((line, user))
+        candidates = valid
+
+    if not candidates:
+        return 0, errors
+
+    hashes = password_hasher.hash_many([user.password for _, user in candidates])
+    rows = [
+        {
+            "username": user.username,
+            "email": user.email,
+            "full_name": user.full_name,
+            "role": user.role,
+            "hashed_password": hashed_password,
+        }
+        for (_, user), hashed_password in zip(candidates, hashes)
+    ]
+
+    try:
+        db.execute(insert(User), rows)
+        db.commit()
+        return len(rows), errors
+    except IntegrityError:
+        # Someone else created one of these users since the check; retry row by row
+        db.rollback()
+
+    created = 0
+    for (line, _), row in zip(candidates, rows):
+        try:
+            with db.begin_nested():
+                db.execute(insert(User), row)
+            created += 1
+        except IntegrityError:
+            errors.append({"row": line, "detail": "Username or email already exists"})
+    db.commit()
+    return created, errors
+
+
+def import_users(db: Session, lines: Iterable[str], chunk_size: int = CHUNK_SIZE) -> dict:
+    """Create the users in a CSV stream; returns the created count and per-row errors"""
+    rows = read_rows(lines)
+    seen_usernames, seen_emails = set(), set()
+    created = 0
+    errors = []
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        chunk_created, chunk_errors = _import_chunk(db, chunk, seen_usernames, seen_emails)
+        created += chunk_created
+        errors.extend(chunk_errors)
+
+    errors.sort(key=lambda error: error["row"])
+    return {"created": created, "errors": errors}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv_file")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    from .core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        with open(args.csv_file, newline="", encoding="utf-8-sig") as csv_file:
+            result = import_users(db, csv_file, args.chunk_size)
+    except ValueError as error:
+        parser.error(str(error))
+    finally:
+        db.close()
+        password_hasher.shutdown()
+
+    for error in result["errors"]:
+        print(f"line {error['row']}: {error['detail']}")
+    print(f"✅ Created {result['created']} users, skipped {len(result['errors'])} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Run the API test suite and workload against every configured database backend.
+
+Each backend gets its own processes, because the engines are built from
+DATABASE_URL at import. The pytest suite in app/tests runs first, against a
+freshly migrated database. If it passes, the load run seeds the sample data and
+drives the main endpoints concurrently through the ASGI app. It reports
+throughput and latency per endpoint, and counts any unexpected status codes as
+failures.
+
+    cd backend && python -m benchmarks.backend_matrix
+    cd backend && python -m benchmarks.backend_matrix --url postgresql://localhost/pm_bench
+
+SQLite always runs on a throwaway file. PostgreSQL runs when --url or
+POSTGRES_URL points at a database that may be wiped.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+async def timed(client, calls, concurrency):
+    """Run the request factories in `calls` with bounded concurrency; returns (responses, latencies)"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def run(call):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await call(client)
+            latencies.append(time.perf_counter() - start)
+            return response
+
+    return await asyncio.gather(*(run(call) for call in calls)), latencies
+
+
+def report(name, responses, latencies, elapsed, expected=(200,)):
+    failures = sum(1 for response in responses if response.status_code not in expected)
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+    print(
+        f"  {name:<18}{len(responses) / elapsed:>9.0f} req/s"
+        f"{statistics.median(latencies) * 1000:>9.1f} ms p50{p95 * 1000:>9.1f} ms p95"
+        f"{'' if not failures else f'   {failures} unexpected status codes'}"
+    )
+    return failures
+
+
+async def workload(requests: int, concurrency: int) -> int:
+    import httpx
+    from app.core.database import engine
+    from app.main import app
+    from app.migrations import run_migrations
+    from app.seed_data import create_sample_data
+
+    run_migrations(engine)
+    create_sample_data()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        login = await client.post("/api/auth/login", json={"username": "admin", "password": "admin123"})
+        assert login.status_code == 200, login.text
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        project_id = (await client.get("/api/projects", headers=headers)).json()[0]["id"]
+
+        phases = [
+            ("create story", lambda i: lambda c: c.post(
+                "/api/stories", headers=headers, json={"title": f"Story {i}", "project_id": project_id})),
+            ("bulk create x50", lambda i: lambda c: c.post(
+                "/api/stories/bulk", headers=headers,
+                json={"stories": [{"title": f"Bulk {i}.{j}", "project_id": project_id} for j in range(50)]})),
+            ("list stories", lambda i: lambda c: c.get(
+                "/api/stories", headers=headers, params={"project_id": project_id, "limit": 50})),
+            ("board", lambda i: lambda c: c.get(f"/api/projects/{project_id}/board", headers=headers)),
+            ("story detail", lambda i: lambda c: c.get(f"/api/stories/{i % 20 + 1}", headers=headers)),
+            ("bulk patch", lambda i: lambda c: c.patch(
+                "/api/stories/bulk", headers=headers,
+                json={"filter": {"project_id": project_id}, "changes": {"story_points": i % 8}})),
+            ("user typeahead", lambda i: lambda c: c.get("/api/users", headers=headers, params={"q": "a"})),
+            ("export", lambda i: lambda c: c.get("/api/stories/export", headers=headers)),
+        ]
+
+        failures = 0
+        for name, make_call in phases:
+            count = requests if name not in ("bulk create x50", "bulk patch", "export") else max(1, requests // 10)
+            start = time.perf_counter()
+            responses, latencies = await timed(client, [make_call(i) for i in range(count)], concurrency)
+            failures += report(name, responses, latencies, time.perf_counter() - start)
+
+            if name == "create story":
+                numbers = [response.json()["story_number"] for response in responses if response.status_code == 200]
+                if len(set(numbers)) != len(numbers):
+                    print("  !! duplicate story numbers under concurrency")
+                    failures += 1
+    return failures
+
+
+def run_backend(database_url: str, args) -> int:
+    print(f"\n{database_url.split('@')[-1]}: test suite")
+    tests = subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider"],
+        env={**os.environ, "TEST_DATABASE_URL": database_url},
+    ).returncode
+    if tests or args.tests_only:
+        return tests
+
+    env = {**os.environ, "DATABASE_URL": database_url}
+    command = [sys.executable, "-m", "benchmarks.backend_matrix", "--worker",
+               "--requests", str(args.requests), "--concurrency", str(args.concurrency)]
+    return subprocess.run(command, env=env).returncode
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", action="append", default=[], help="extra database URL to run against")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--tests-only", action="store_true", help="skip the load run")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        from app.core.database import engine
+        from app.core.hashing import password_hasher
+
+        print(f"\n{engine.dialect.name} ({engine.url.render_as_string(hide_password=True)})")
+        try:
+            failures = asyncio.run(workload(args.requests, args.concurrency))
+        finally:
+            password_hasher.shutdown()
+        sys.exit(1 if failures else 0)
+
+    urls = [f"sqlite:///{tempfile.mkdtemp()}/bench.db"] + args.url
+    if os.environ.get("POSTGRES_URL") and os.environ["POSTGRES_URL"] not in urls:
+        urls.append(os.environ["POSTGRES_URL"])
+
+    results = {url: run_backend(url, args) for url in urls}
+    print()
+    for url, returncode in results.items():
+        print(f"{'ok    ' if returncode == 0 else 'FAILED'} {url.split('@')[-1]}")
+    sys.exit(0 if all(returncode == 0 for returncode in results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
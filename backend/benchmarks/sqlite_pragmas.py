@@ -0,0 +1,99 @@
+"""Read/write throughput of the SQLite pragma profiles under a mixed load.
+
+For each profile in SQLITE_PRAGMA_PROFILES, builds a throwaway database, then
+runs reader threads issuing board-style story queries alongside one writer
+thread updating stories, and reports operations per second and lock errors.
+
+    cd backend && python -m benchmarks.sqlite_pragmas --stories 100000 --readers 8 --seconds 5
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from .story_index_plans import STATUSES, populate
+
+READ_SQL = "SELECT * FROM stories WHERE project_id = ? AND status = ? ORDER BY id LIMIT 100"
+WRITE_SQL = "UPDATE stories SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?"
+
+
+def run_load(engine, stories: int, readers: int, seconds: float) -> dict:
+    from sqlalchemy.exc import OperationalError
+
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def reader(seed):
+        rng = random.Random(seed)
+        done = errors = 0
+        with engine.connect() as connection:
+            while time.perf_counter() < deadline:
+                try:
+                    connection.exec_driver_sql(READ_SQL, (rng.randint(1, 20), rng.choice(STATUSES))).all()
+                    connection.commit()
+                    done += 1
+                except OperationalError:
+                    connection.rollback()
+                    errors += 1
+        with lock:
+            counts["reads"] += done
+            counts["errors"] += errors
+
+    def writer():
+        rng = random.Random(-1)
+        done = errors = 0
+        with engine.connect() as connection:
+            while time.perf_counter() < deadline:
+                try:
+                    connection.exec_driver_sql(WRITE_SQL, (rng.choice(STATUSES), rng.randint(1, stories)))
+                    connection.commit()
+                    done += 1
+                except OperationalError:
+                    connection.rollback()
+                    errors += 1
+        with lock:
+            counts["writes"] += done
+            counts["errors"] += errors
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {name: value / seconds if name != "errors" else value for name, value in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stories", type=int, default=100_000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    from sqlalchemy import create_engine
+    from app.core.database import SQLITE_PRAGMA_PROFILES, Base, install_sqlite_pragmas
+    from app import models  # noqa: F401 (registers every table)
+
+    print(f"{'profile':<12}{'reads/s':>10}{'writes/s':>10}{'lock errors':>13}")
+    for profile, pragmas in SQLITE_PRAGMA_PROFILES.items():
+        path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        engine = create_engine(
+            f"sqlite:///{path}",
+            connect_args={"check_same_thread": False},
+            pool_size=args.readers + 1,
+        )
+        install_sqlite_pragmas(engine, pragmas)
+        Base.metadata.create_all(bind=engine)
+        populate(engine, args.stories)
+
+        result = run_load(engine, args.stories, args.readers, args.seconds)
+        print(f"{profile:<12}{result['reads']:>10.0f}{result['writes']:>10.0f}{result['errors']:>13}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Query plans and timings for the story list filters before and after migration v0001.
+
+Builds a throwaway SQLite database without the composite story indexes, prints
+EXPLAIN QUERY PLAN and average latency for each filter get_stories runs, applies
+the migrations and prints the same report again (SCAN -> SEARCH).
+
+    cd backend && python -m benchmarks.story_index_plans --stories 200000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+QUERIES = {
+    "project + status": (
+        "SELECT * FROM stories WHERE project_id = ? AND status = ? ORDER BY id LIMIT 100",
+        (3, "IN_PROGRESS"),
+    ),
+    "assignee + status": (
+        "SELECT * FROM stories WHERE assignee_id = ? AND status = ? ORDER BY id LIMIT 100",
+        (7, "BLOCKED"),
+    ),
+    "sprint + status": (
+        "SELECT * FROM stories WHERE sprint_id = ? AND status = ? ORDER BY id LIMIT 100",
+        (42, "TO_DO"),
+    ),
+    "project by updated_at": (
+        "SELECT * FROM stories WHERE project_id = ? ORDER BY updated_at DESC LIMIT 100",
+        (3,),
+    ),
+}
+
+STATUSES = ["BACKLOG", "TO_DO", "IN_PROGRESS", "BLOCKED", "VALIDATION", "COMPLETED"]
+PRIORITIES = ["LOW", "MEDIUM", "HIGH"]
+
+
+def populate(engine, stories: int, projects: int = 20, users: int = 50, sprints: int = 200):
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO users (id, username, email, hashed_password, full_name, role) "
+            "VALUES (?, ?, ?, 'x', ?, 'USER')",
+            [(i, f"user{i}", f"user{i}@example.com", f"User {i}") for i in range(1, users + 1)],
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO projects (id, name, prefix, created_by) VALUES (?, ?, ?, 1)",
+            [(i, f"Project {i}", f"P{i}") for i in range(1, projects + 1)],
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO sprints (id, name, status, project_id, created_by, start_date, end_date) "
+            "VALUES (?, ?, 'ACTIVE', ?, 1, '2024-01-01', '2024-01-15')",
+            [(i, f"Sprint {i}", i % projects + 1) for i in range(1, sprints + 1)],
+        )
+        rng = random.Random(0)
+        connection.exec_driver_sql(
+            "INSERT INTO stories (story_number, title, status, priority, story_type, project_id, "
+            "assignee_id, created_by, sprint_id, story_points, updated_at) "
+            "VALUES (?, ?, ?, ?, 'STORY', ?, ?, 1, ?, ?, ?)",
+            [
+                (
+                    f"S-{i}", f"Story {i}", rng.choice(STATUSES), rng.choice(PRIORITIES),
+                    rng.randint(1, projects), rng.randint(1, users), rng.randint(1, sprints),
+                    rng.randint(1, 13), f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                )
+                for i in range(stories)
+            ],
+        )
+
+
+def report(engine, label: str, repeat: int):
+    print(f"\n== {label}")
+    with engine.connect() as connection:
+        for name, (sql, params) in QUERIES.items():
+            plan = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + sql, params).all()
+            start = time.perf_counter()
+            for _ in range(repeat):
+                connection.exec_driver_sql(sql, params).all()
+            elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+            print(f"{name:<24}{elapsed_ms:8.2f} ms   " + " | ".join(row[-1] for row in plan))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stories", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    from app.core.database import Base, engine
+    from app.migrations import run_migrations
+    from app.models.story import Story
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        for index in Story.__table__.indexes:
+            if index.name.startswith("ix_stories_") and len(index.expressions) > 1:
+                connection.exec_driver_sql(f"DROP INDEX {index.name}")
+
+    populate(engine, args.stories)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ANALYZE")
+
+    report(engine, f"before migration ({args.stories} stories)", args.repeat)
+    print("\napplied migrations:", ", ".join(run_migrations(engine)))
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ANALYZE")
+    report(engine, "after migration", args.repeat)
+
+
+if __name__ == "__main__":
+    main()
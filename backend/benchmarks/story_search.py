@@ -0,0 +1,81 @@
+"""Latency of GET /api/stories/search style queries against the FTS5 index.
+
+Builds a throwaway SQLite database with synthetic story text, applies the
+migrations (which build stories_fts) and times the search query for common,
+rare and prefix terms, with and without a project filter.
+
+    cd backend && python -m benchmarks.story_search --stories 1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from .story_index_plans import populate
+
+
+def fill_text(engine, stories: int, vocabulary: int = 20000):
+    rng = random.Random(1)
+    words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 9)))
+             for _ in range(vocabulary)]
+    # Zipf-ish: a few words are very common, most are rare
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+
+    def sentence(length):
+        return " ".join(rng.choices(words, weights, k=length))
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "UPDATE stories SET title = ?, description = ?, acceptance_criteria = ? WHERE id = ?",
+            [(sentence(6), sentence(40), sentence(20), story_id) for story_id in range(1, stories + 1)],
+        )
+    return words
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stories", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    from app.api.stories import _match_expression
+    from app.core.database import Base, engine
+    from app.migrations import run_migrations
+    from app import models  # noqa: F401 (registers every table)
+
+    Base.metadata.create_all(bind=engine)
+    populate(engine, args.stories)
+    words = fill_text(engine, args.stories)
+
+    start = time.perf_counter()
+    run_migrations(engine)
+    print(f"built FTS index for {args.stories} stories in {time.perf_counter() - start:.1f} s\n")
+
+    sql = (
+        "SELECT stories.*, snippet(stories_fts, -1, '[', ']', '…', 12), "
+        "bm25(stories_fts, 10.0, 1.0, 1.0, 5.0) AS rank "
+        "FROM stories JOIN stories_fts ON stories_fts.rowid = stories.id "
+        "WHERE stories_fts MATCH ? {filter} ORDER BY rank LIMIT 20"
+    )
+    cases = {
+        "common word": (words[0], None),
+        "rare word": (words[5000], None),
+        "two words": (f"{words[10]} {words[200]}", None),
+        "prefix": (words[300][:3], None),
+        "common word, project 3": (words[0], 3),
+    }
+    with engine.connect() as connection:
+        for name, (q, project_id) in cases.items():
+            params = (_match_expression(q),) + ((project_id,) if project_id else ())
+            statement = sql.format(filter="AND stories.project_id = ?" if project_id else "")
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                rows = connection.exec_driver_sql(statement, params).all()
+            elapsed_ms = (time.perf_counter() - start) * 1000 / args.repeat
+            print(f"{name:<26}{elapsed_ms:8.2f} ms  ({len(rows)} hits shown)")
+
+
+if __name__ == "__main__":
+    main()
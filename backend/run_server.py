@@ -1,8 +1,10 @@
 import uvicorn
+from app.migrate import upgrade
 from app.seed_data import create_sample_data
 
 if __name__ == "__main__":
-    # Create sample data if it doesn't exist
+    # Bring the schema up to date, then create sample data if it doesn't exist
+    upgrade()
     create_sample_data()
     
     # Start the server